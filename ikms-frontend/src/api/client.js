@@ -10,15 +10,31 @@ const apiClient = axios.create({
 });
 
 // Question-Answering endpoint
-export const askQuestion = async (question) => {
-  const response = await apiClient.post('/qa', { question });
+// `namespace` scopes retrieval to one collection; `filters` may hold
+// { source, tags, indexed_after, indexed_before }; `sessionId` continues a
+// conversation so follow-ups reuse the previous turns' chunks.
+export const askQuestion = async (question, { namespace, filters, sessionId } = {}) => {
+  const response = await apiClient.post('/qa', {
+    question,
+    namespace,
+    filters,
+    session_id: sessionId,
+  });
+  return response.data;
+};
+
+// Retrieval warm-up for a question that is still being typed
+export const prefetchQuestion = async (question, { namespace, filters } = {}) => {
+  const response = await apiClient.post('/qa/prefetch', { question, namespace, filters });
   return response.data;
 };
 
 // PDF Indexing endpoint
-export const indexPDF = async (file) => {
+export const indexPDF = async (file, { namespace, tags } = {}) => {
   const formData = new FormData();
   formData.append('file', file);
+  if (namespace) formData.append('namespace', namespace);
+  if (tags?.length) formData.append('tags', tags.join(','));
   
   const response = await apiClient.post('/index-pdf', formData, {
     headers: {
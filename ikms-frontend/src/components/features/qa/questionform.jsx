@@ -1,11 +1,26 @@
-import { useState } from 'react';
+import { useEffect, useState } from 'react';
 import { Button } from '../../common/button';
-import { Send, Sparkles, Info } from 'lucide-react';
+import { Send, Sparkles, Info, MessageSquarePlus } from 'lucide-react';
+import { prefetchQuestion } from '../../../api/client';
 
-export const QuestionForm = ({ onSubmit, loading, useCritic, onToggleCritic }) => {
+const PREFETCH_DEBOUNCE_MS = 400;
+const PREFETCH_MIN_CHARS = 12;
+
+export const QuestionForm = ({ onSubmit, loading, useCritic, onToggleCritic, inConversation, onNewConversation }) => {
   const [question, setQuestion] = useState('');
   const [showInfo, setShowInfo] = useState(false);
 
+  // Warm retrieval while the user is still typing; failures are harmless
+  useEffect(() => {
+    const partial = question.trim();
+    if (loading || partial.length < PREFETCH_MIN_CHARS) return;
+
+    const timer = setTimeout(() => {
+      prefetchQuestion(partial).catch(() => {});
+    }, PREFETCH_DEBOUNCE_MS);
+    return () => clearTimeout(timer);
+  }, [question, loading]);
+
   const handleSubmit = (e) => {
     e.preventDefault();
     if (question.trim()) {
@@ -69,10 +84,20 @@ export const QuestionForm = ({ onSubmit, loading, useCritic, onToggleCritic }) =
         )}
       </div>
 
-      <Button type="submit" loading={loading} className="w-full" disabled={!question.trim()}>
-        <Send className="w-4 h-4" />
-        {loading ? 'Processing...' : 'Ask Question'}
-      </Button>
+      <div className="flex gap-3">
+        <Button type="submit" loading={loading} className="flex-1" disabled={!question.trim()}>
+          <Send className="w-4 h-4" />
+          {loading ? 'Processing...' : inConversation ? 'Ask Follow-up' : 'Ask Question'}
+        </Button>
+
+        {/* Follow-ups reuse the previous turns; start over for an unrelated question */}
+        {inConversation && (
+          <Button type="button" variant="secondary" onClick={onNewConversation} disabled={loading}>
+            <MessageSquarePlus className="w-4 h-4" />
+            New Conversation
+          </Button>
+        )}
+      </div>
     </form>
   );
 };
\ No newline at end of file
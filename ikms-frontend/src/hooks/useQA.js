@@ -6,6 +6,7 @@ export const useQA = () => {
   const [loading, setLoading] = useState(false);
   const [answer, setAnswer] = useState(null);
   const [error, setError] = useState(null);
+  const [sessionId, setSessionId] = useState(null);
 
   const submitQuestion = async (question) => {
     if (!question.trim()) {
@@ -17,8 +18,9 @@ export const useQA = () => {
     setError(null);
     
     try {
-      const result = await askQuestion(question);
+      const result = await askQuestion(question, { sessionId });
       setAnswer(result);
+      setSessionId(result.session_id ?? null);
       toast.success('Answer retrieved successfully!');
       return result;
     } catch (err) {
@@ -31,10 +33,18 @@ export const useQA = () => {
     }
   };
 
+  // Start a new conversation: the next question is answered from scratch
+  const resetSession = () => {
+    setSessionId(null);
+    setAnswer(null);
+  };
+
   return {
     loading,
     answer,
     error,
+    sessionId,
     submitQuestion,
+    resetSession,
   };
 };
\ No newline at end of file
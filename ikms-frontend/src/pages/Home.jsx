@@ -9,7 +9,7 @@ import { CheckCircle, Sparkles } from 'lucide-react';
 
 export const Home = () => {
   const { loading: uploadLoading, progress, result: uploadResult, uploadPDF }   = useIndexing();
-  const { loading: qaLoading, answer, useCritic, submitQuestion, toggleCritic } = useQA();
+  const { loading: qaLoading, answer, useCritic, sessionId, submitQuestion, toggleCritic, resetSession } = useQA();
   const [originalContext, setOriginalContext]                                   = useState(null);
 
   const handleQuestionSubmit = async (question) => {
@@ -138,10 +138,12 @@ export const Home = () => {
           </div>
 
           <QuestionForm 
-            onSubmit       = {handleQuestionSubmit}
-            loading        = {qaLoading}
-            useCritic      = {useCritic}
-            onToggleCritic = {toggleCritic}
+            onSubmit          = {handleQuestionSubmit}
+            loading           = {qaLoading}
+            useCritic         = {useCritic}
+            onToggleCritic    = {toggleCritic}
+            inConversation    = {Boolean(sessionId)}
+            onNewConversation = {resetSession}
           />
 
           {/* Step 3 - Answers & Analysis Section */}
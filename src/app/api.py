@@ -1,16 +1,24 @@
+import json
 import logging
 import os
+import re
+import time
 from pathlib import Path
+from typing import Any, Callable
 
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi import FastAPI, File, HTTPException, Request, UploadFile, status
-from fastapi.responses import JSONResponse
+from fastapi import FastAPI, File, Form, HTTPException, Request, UploadFile, status
+from fastapi.responses import JSONResponse, StreamingResponse
+from starlette.concurrency import iterate_in_threadpool, run_in_threadpool
 from openai import APIError as OpenAIAPIError
+from openai import RateLimitError as OpenAIRateLimitError
 from pinecone.exceptions import PineconeException
 
-from .models import QuestionRequest, QAResponse
-from .services.qa_service import answer_question
+from .models import NAMESPACE_PATTERN, QuestionRequest, QAResponse
+from .services.qa_service import RunConflict, answer_from_cache, answer_question, prefetch_question, stream_answer
 from .services.indexing_service import index_pdf_file
+from .services.scheduler import SchedulerOverloaded, get_scheduler, qa_demand, stream_demand, usage_from_metrics
+from .core.llm.rate_limits import report_rate_limited, retry_after_seconds
 
 # Configure logging
 logging.basicConfig(
@@ -43,6 +51,60 @@ app.add_middleware(
 )
 
 
+class _ReleasingStreamingResponse(StreamingResponse):
+    """StreamingResponse that calls `on_close` exactly once, however it ends.
+
+    Unlike a `finally` inside the body generator, this also runs when the
+    response is cancelled (e.g. client disconnect) or fails to start before
+    the generator is first iterated.
+    """
+
+    def __init__(self, content: Any, on_close: Callable[[], None], **kwargs: Any):
+        super().__init__(content, **kwargs)
+        self._on_close = on_close
+
+    async def __call__(self, scope: Any, receive: Any, send: Any) -> None:
+        try:
+            await super().__call__(scope, receive, send)
+        finally:
+            self._on_close()
+
+
+@app.exception_handler(SchedulerOverloaded)
+async def scheduler_overloaded_handler(request: Request, exc: SchedulerOverloaded) -> JSONResponse:
+    """Shed load with 429 + Retry-After when a request cannot be admitted."""
+    logger.warning(f"Rejecting {request.url.path}: {exc.reason}")
+    return JSONResponse(
+        status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+        content={"detail": f"{exc.reason}. Please retry later."},
+        headers={"Retry-After": str(exc.retry_after)},
+    )
+
+
+@app.exception_handler(RunConflict)
+async def run_conflict_handler(request: Request, exc: RunConflict) -> JSONResponse:
+    """Reject a reused request id with 409 instead of resuming the wrong run."""
+    logger.warning(f"Rejecting {request.url.path}: {exc}")
+    return JSONResponse(
+        status_code=status.HTTP_409_CONFLICT,
+        content={"detail": str(exc)},
+    )
+
+
+@app.exception_handler(OpenAIRateLimitError)
+async def openai_rate_limit_handler(request: Request, exc: OpenAIRateLimitError) -> JSONResponse:
+    """Propagate provider rate limiting as 429 and back off the scheduler."""
+    retry_after = int(retry_after_seconds(exc))
+
+    logger.warning(f"OpenAI rate limit hit, backing off {retry_after}s: {exc}")
+    report_rate_limited(exc)
+    return JSONResponse(
+        status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+        content={"detail": "AI service is rate limited. Please retry later."},
+        headers={"Retry-After": str(retry_after)},
+    )
+
+
 @app.exception_handler(OpenAIAPIError)
 async def openai_exception_handler(request: Request, exc: OpenAIAPIError) -> JSONResponse:
     """Handle OpenAI API errors with appropriate logging and response."""
@@ -83,7 +145,7 @@ async def health_check() -> dict:
 
 
 @app.post("/qa", response_model=QAResponse, status_code=status.HTTP_200_OK)
-async def qa_endpoint(payload: QuestionRequest) -> QAResponse:
+async def qa_endpoint(payload: QuestionRequest, request: Request) -> QAResponse:
     """Submit a question to the multi-agent RAG system.
 
     The question is processed through:
@@ -91,6 +153,16 @@ async def qa_endpoint(payload: QuestionRequest) -> QAResponse:
     2. Context Critic Agent - filters/ranks chunks
     3. Summarization Agent - generates draft answer
     4. Verification Agent - removes hallucinations
+
+    Requests are admitted through the QA scheduler, which bounds concurrent
+    graph runs and queues against per-model rate-limit budgets; requests
+    that cannot be admitted in time are rejected with 429 + Retry-After.
+    First-turn questions found in the shared answer cache skip the pipeline
+    and admission control.
+
+    Transient OpenAI errors are retried inside the graph. If a run still
+    fails, retrying with the same `request_id` (or `Idempotency-Key` /
+    `X-Request-ID` header) resumes it from the last completed agent.
     """
     question = payload.question.strip()
     if not question:
@@ -101,8 +173,34 @@ async def qa_endpoint(payload: QuestionRequest) -> QAResponse:
 
     logger.info(f"Processing question: {question[:100]}...")
 
+    filters = payload.filters.to_service_filters() if payload.filters else None
+    request_id = (
+        payload.request_id
+        or request.headers.get("Idempotency-Key")
+        or request.headers.get("X-Request-ID")
+    )
+
     try:
-        result = answer_question(question)
+        # Cached first-turn answers cost no LLM calls: skip admission control
+        result = await run_in_threadpool(
+            answer_from_cache,
+            question,
+            namespace=payload.namespace,
+            filters=filters,
+            session_id=payload.session_id,
+        )
+        if result is None:
+            result = await get_scheduler().run(
+                qa_demand(),
+                answer_question,
+                question,
+                namespace=payload.namespace,
+                filters=filters,
+                session_id=payload.session_id,
+                request_id=request_id,
+            )
+    except (SchedulerOverloaded, RunConflict):
+        raise
     except Exception as e:
         logger.error(f"Error processing question: {e}")
         raise
@@ -115,12 +213,95 @@ async def qa_endpoint(payload: QuestionRequest) -> QAResponse:
         context_rationale      = result.get("context_rationale"),
         chunk_relevance_scores = result.get("chunk_relevance_scores"),
         draft_answer           = result.get("draft_answer"),
+        metrics                = result.get("metrics"),
+        session_id             = result.get("session_id"),
+        request_id             = request_id,
     )
 
 
+@app.post("/qa/stream", status_code=status.HTTP_200_OK)
+async def qa_stream_endpoint(payload: QuestionRequest) -> StreamingResponse:
+    """Submit a question and stream the verified answer as NDJSON events.
+
+    Retrieval and the Context Critic run first (`context` event); the
+    summarizer's output is then verified sentence by sentence while it is
+    being generated (`sentence` events), followed by a final `answer` event
+    with the assembled answer, draft and metrics.
+    """
+    question = payload.question.strip()
+    if not question:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="`question` must be a non-empty string.",
+        )
+
+    if payload.session_id or payload.request_id:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="`session_id` and `request_id` are not supported by `/qa/stream`; use `/qa`.",
+        )
+
+    logger.info(f"Streaming question: {question[:100]}...")
+
+    filters = payload.filters.to_service_filters() if payload.filters else None
+
+    # Admit before the response starts so overload can still be a 429
+    scheduler = get_scheduler()
+    reservation = await scheduler.acquire(stream_demand())
+    started = time.monotonic()
+
+    async def events():
+        try:
+            stream = stream_answer(question, namespace=payload.namespace, filters=filters)
+            async for event in iterate_in_threadpool(stream):
+                if event["type"] == "answer":
+                    scheduler.settle(reservation, usage_from_metrics(event["metrics"]))
+                yield json.dumps(event) + "\n"
+        except Exception as e:
+            if isinstance(e, OpenAIRateLimitError):
+                report_rate_limited(e)
+            logger.error(f"Error streaming answer: {e}")
+            yield json.dumps({"type": "error", "detail": "Failed to generate answer."}) + "\n"
+
+    return _ReleasingStreamingResponse(
+        events(),
+        on_close   = lambda: scheduler.release(time.monotonic() - started),
+        media_type = "application/x-ndjson",
+    )
+
+
+@app.post("/qa/prefetch", status_code=status.HTTP_200_OK)
+async def qa_prefetch_endpoint(payload: QuestionRequest) -> dict:
+    """Warm retrieval for a question the user is still typing.
+
+    Intended to be called on debounced typing: the partial question is
+    embedded and its results cached briefly, so the real `/qa` request can
+    skip the Pinecone round trip when its query is close enough. Calls
+    beyond `PREFETCH_RPM_LIMIT` are rejected with 429.
+    """
+    get_scheduler().admit_prefetch()
+    filters = payload.filters.to_service_filters() if payload.filters else None
+
+    prefetched = await run_in_threadpool(
+        prefetch_question,
+        payload.question.strip(),
+        namespace=payload.namespace,
+        filters=filters,
+    )
+    return {"prefetched": prefetched}
+
+
 @app.post("/index-pdf", status_code=status.HTTP_200_OK)
-async def index_pdf(file: UploadFile = File(...)) -> dict:
-    """Upload a PDF and index it into the vector database."""
+async def index_pdf(
+    file     : UploadFile = File(...),
+    namespace: str | None = Form(None),
+    tags     : str | None = Form(None),
+) -> dict:
+    """Upload a PDF and index it into the vector database.
+
+    `namespace` selects the collection/tenant the chunks are written to and
+    `tags` is a comma-separated list stored on every chunk for filtering.
+    """
     if file.content_type not in ("application/pdf",):
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
@@ -133,9 +314,19 @@ async def index_pdf(file: UploadFile = File(...)) -> dict:
             detail="Filename is required.",
         )
 
-    logger.info(f"Indexing PDF: {file.filename}")
+    if namespace and not re.fullmatch(NAMESPACE_PATTERN, namespace):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="`namespace` may only contain letters, digits, '_' and '-'.",
+        )
+
+    tag_list = [tag.strip() for tag in tags.split(",") if tag.strip()] if tags else []
+
+    logger.info(f"Indexing PDF: {file.filename} (namespace={namespace or 'default'})")
 
     upload_dir = Path("data/uploads")
+    if namespace:
+        upload_dir = upload_dir / namespace
     upload_dir.mkdir(parents=True, exist_ok=True)
 
     file_path = upload_dir / file.filename
@@ -143,7 +334,10 @@ async def index_pdf(file: UploadFile = File(...)) -> dict:
     try:
         contents = await file.read()
         file_path.write_bytes(contents)
-        chunks_indexed = index_pdf_file(file_path)
+        # Indexing blocks on the cross-worker index lock: keep it off the event loop
+        chunks_indexed = await run_in_threadpool(
+            index_pdf_file, file_path, namespace=namespace, tags=tag_list,
+        )
     except Exception as e:
         logger.error(f"Error indexing PDF {file.filename}: {e}")
         raise
@@ -153,5 +347,7 @@ async def index_pdf(file: UploadFile = File(...)) -> dict:
     return {
         "filename": file.filename,
         "chunks_indexed": chunks_indexed,
+        "namespace": namespace,
+        "tags": tag_list,
         "message": "PDF indexed successfully.",
     }
\ No newline at end of file
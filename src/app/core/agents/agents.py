@@ -8,48 +8,111 @@ from dotenv import load_dotenv
 # Load environment variables FIRST
 load_dotenv()
 import json
-from typing import List
+import time
+from functools import lru_cache
+from typing import Any, Dict, List, Tuple
 
 from langchain.agents import create_agent
 from langchain_core.messages import AIMessage, HumanMessage, ToolMessage
 
-from ..llm.factory import create_chat_model
+from ..config import get_settings
+from ..llm.factory import create_chat_model, is_transient_error
+from ..llm.pricing import estimate_cost_usd
+from ..llm.rate_limits import reserve_calls
+from ..retrieval.chunk_store import ChunkRecord, get_chunk_store
+from ..retrieval.serialization import format_chunk_blocks
 from .prompts import (
     RETRIEVAL_SYSTEM_PROMPT,
     CONTEXT_CRITIC_SYSTEM_PROMPT,
-    SUMMARIZATION_SYSTEM_PROMPT,
-    VERIFICATION_SYSTEM_PROMPT,
+    CONTEXT_CRITIC_OUTPUT_INSTRUCTIONS,
+    GROUNDED_ANSWER_SYSTEM_PROMPT,
+    SUMMARIZATION_INSTRUCTIONS,
+    VERIFICATION_INSTRUCTIONS,
 )
 
 from .state import QAState
-from .tools import retrieval_tool
+from .support import content_terms, support_score
+from .tools import RetrievalContext, retrieval_tool
 
 # Define agents at module level for reuse
 retrieval_agent = create_agent(
     model=create_chat_model(),
     tools=[retrieval_tool],
     system_prompt=RETRIEVAL_SYSTEM_PROMPT,
+    context_schema=RetrievalContext,
 )
 
 context_critic_agent = create_agent(
-      # model=create_chat_model(model_name="gpt-4o-mini", temperature=0.2),
-    model = "gpt-4o-mini",
+    model=create_chat_model(
+        model_name=get_settings().openai_critic_model_name,
+        temperature=0.2,
+    ),
     tools=[],  # No tools needed, just analysis
     system_prompt=CONTEXT_CRITIC_SYSTEM_PROMPT,
 )
 
+# Summarization and verification share a system prompt so that their
+# back-to-back calls over the same context share a cacheable prefix.
 summarization_agent = create_agent(
     model=create_chat_model(),
     tools=[],
-    system_prompt=SUMMARIZATION_SYSTEM_PROMPT,
+    system_prompt=GROUNDED_ANSWER_SYSTEM_PROMPT,
 )
 
 verification_agent = create_agent(
     model=create_chat_model(),
     tools=[],
-    system_prompt=VERIFICATION_SYSTEM_PROMPT,
+    system_prompt=GROUNDED_ANSWER_SYSTEM_PROMPT,
 )
 
+@lru_cache(maxsize=16)
+def _agent_for(role: str, model_name: str, max_tokens: int | None = None) -> Any:
+    """Build (and cache) an agent for `role` running on a non-default model.
+
+    Used when a run's `pipeline` options override the configured models
+    (e.g. by the offline evaluation runner) and for the model tiers picked
+    by the router, which also cap output tokens.
+    """
+    if role == "retrieval":
+        return create_agent(
+            model=create_chat_model(model_name=model_name),
+            tools=[retrieval_tool],
+            system_prompt=RETRIEVAL_SYSTEM_PROMPT,
+            context_schema=RetrievalContext,
+        )
+    if role == "context_critic":
+        return create_agent(
+            model=create_chat_model(model_name=model_name, temperature=0.2),
+            tools=[],
+            system_prompt=CONTEXT_CRITIC_SYSTEM_PROMPT,
+        )
+    return create_agent(
+        model=create_chat_model(model_name=model_name, max_tokens=max_tokens),
+        tools=[],
+        system_prompt=GROUNDED_ANSWER_SYSTEM_PROMPT,
+    )
+
+def _answer_agent(role: str, state: QAState) -> Tuple[Any, str, str | None]:
+    """Pick the summarization/verification agent for a run.
+
+    Pipeline overrides win over the router's choice; without either, the
+    module-level agent on the configured model is used.
+
+    Returns:
+        `(agent, model_name, tier)`.
+    """
+    model_name = (state.get("pipeline") or {}).get("model_name")
+    if model_name:
+        return _agent_for(role, model_name), model_name, None
+
+    route = state.get("route")
+    if route:
+        choice = route[role]
+        return _agent_for(role, choice["model_name"], choice["max_tokens"]), choice["model_name"], route["tier"]
+
+    default = summarization_agent if role == "summarization" else verification_agent
+    return default, get_settings().openai_model_name, None
+
 def _extract_last_ai_content(messages: List[object]) -> str: 
     """Extract the content of the last AIMessage in a messages list."""
     for msg in reversed(messages):
@@ -57,6 +120,13 @@ def _extract_last_ai_content(messages: List[object]) -> str:
             return str(msg.content)
     return ""
 
+def _hit_output_limit(messages: List[object]) -> bool:
+    """Whether the last AIMessage was cut off by its `max_tokens` budget."""
+    for msg in reversed(messages):
+        if isinstance(msg, AIMessage):
+            return msg.response_metadata.get("finish_reason") == "length"
+    return False
+
 # def retrieval_node(state: QAState) -> QAState: 
     """Retrieval Agent node: gathers context from vector store.
 
@@ -82,58 +152,219 @@ def _extract_last_ai_content(messages: List[object]) -> str:
         "context":context,
     }
 
+def _usage_metrics(
+    messages  : List[object],
+    started   : float,
+    model_name: str | None = None,
+) -> Dict[str, Any]:
+    """Summarize token usage and latency of the LLM calls made by one node.
+
+    `cached_input_tokens` counts prompt tokens served from the provider's
+    prompt cache, which is what the cache-friendly message layout targets.
+    With `model_name`, the model and its estimated cost are included too.
+    """
+    calls = input_tokens = cached_input_tokens = output_tokens = 0
+    for msg in messages:
+        if isinstance(msg, AIMessage) and msg.usage_metadata:
+            usage = msg.usage_metadata
+            calls               += 1
+            input_tokens        += usage.get("input_tokens", 0)
+            output_tokens       += usage.get("output_tokens", 0)
+            cached_input_tokens += usage.get("input_token_details", {}).get("cache_read", 0)
+
+    metrics = {
+        "llm_calls"          : calls,
+        "input_tokens"       : input_tokens,
+        "cached_input_tokens": cached_input_tokens,
+        "output_tokens"      : output_tokens,
+        "latency_ms"         : round((time.perf_counter() - started) * 1000, 1),
+    }
+    if model_name:
+        metrics["model"] = model_name
+        metrics["estimated_cost_usd"] = estimate_cost_usd(
+            model_name, input_tokens, cached_input_tokens, output_tokens
+        )
+    return metrics
+
+def _grounded_messages(context: str, task: str) -> List[HumanMessage]:
+    """Build the cache-friendly message layout shared by summarization/verification.
+
+    The context goes into its own leading message so that it is byte-identical
+    across both calls; everything request-specific follows it.
+    """
+    return [
+        HumanMessage(content=f"CONTEXT:\n{context}"),
+        HumanMessage(content=task),
+    ]
+
+def render_context(state: QAState) -> str:
+    """Render the context the answer is grounded in from the chunk store.
+
+    The graph state carries chunk ids only. The context is the chunks kept
+    by the critic, in its relevance order and with their retrieval-time
+    numbers, or every retrieved chunk when the critic did not run or kept
+    none.
+    """
+    chunk_ids = state.get("chunk_ids") or []
+    kept = state.get("kept_chunk_ids")
+    if not kept:
+        return format_chunk_blocks(get_chunk_store().get_many(chunk_ids))
+
+    records = get_chunk_store().get_many(kept)
+    position = {cid: i for i, cid in enumerate(chunk_ids)}
+    indices = [position.get(record.chunk_id, i) for i, record in enumerate(records)]
+    return format_chunk_blocks(records, indices=indices)
+
 def retrieval_node(state: QAState) -> dict: 
     """Retrieval Agent node: gathers context from vector store.
 
-    Enhanced to store both formatted context and raw documents for critic agent.
+    Stores the retrieved chunk ids; the chunks themselves live in the chunk
+    store and are rendered by the nodes that need their text.
+    The request's namespace and metadata filters are injected into the
+    retrieval tool as runtime context so every search stays scoped.
+
+    For follow-up questions in a session, the most recently kept chunks of
+    earlier turns are carried over as candidates (the session is bound to
+    this namespace and filters). When they already contain every content
+    term of the question, retrieval is skipped; otherwise earlier questions
+    are given to the agent so it can resolve references, and only
+    `session_followup_retrieval_k` new chunks are fetched per search.
     """
     question = state["question"]
+    history = state.get("history") or []
+    pipeline = state.get("pipeline") or {}
+    settings = get_settings()
+    started = time.perf_counter()
+    model_name = pipeline.get("model_name")
+
+    carried = get_chunk_store().get_many(state.get("session_chunk_ids") or [])
+    k = pipeline.get("retrieval_k")
+    if carried:
+        carried_terms = content_terms(" ".join(record.text for record in carried))
+        if support_score(question, carried_terms) >= settings.session_reuse_min_support:
+            return {
+                "chunk_ids": [record.chunk_id for record in carried],
+                "metrics": {"retrieval": {
+                    **_usage_metrics([], started, model_name or settings.openai_model_name),
+                    "reused_session_chunks": True,
+                }},
+            }
+        k = min(k or settings.retrieval_k, settings.session_followup_retrieval_k)
 
-    result = retrieval_agent.invoke({"messages": [HumanMessage(content=question)]})
+    scope = RetrievalContext(
+        namespace = state.get("namespace"),
+        filters   = state.get("filters"),
+        k         = k,
+    )
+    agent = _agent_for("retrieval", model_name) if model_name else retrieval_agent
+
+    user_content = question
+    if history:
+        previous = "\n".join(f"- {q}" for q in history)
+        user_content = (
+            f"Previous questions in this conversation (most recent last):\n{previous}\n\n"
+            f"Current question: {question}"
+        )
+
+    result = agent.invoke(
+        {"messages": [HumanMessage(content=user_content)]},
+        context=scope,
+    )
 
     messages = result.get("messages", [])
-    context = ""
-    raw_docs = []
-    
-    # Extract context from ToolMessage
-    for msg in reversed(messages):
-        if isinstance(msg, ToolMessage):
-            context = str(msg.content)
-            break
-    
-    # Try to extract raw documents from the tool result
-    for msg in messages:
-        if isinstance(msg, ToolMessage) and hasattr(msg, 'artifact'):
-            if isinstance(msg.artifact, list):
-                raw_docs = msg.artifact
-    
-    # Create individual chunk strings with IDs
-    raw_context_blocks = []
-    if context:
-        if raw_docs:
-            for i, doc in enumerate(raw_docs):
-                chunk_text = f"[Chunk {i}]\n"
-                if hasattr(doc, 'metadata') and doc.metadata:
-                    if 'source' in doc.metadata:
-                        chunk_text += f"Source: {doc.metadata['source']}\n"
-                    if 'page' in doc.metadata:
-                        chunk_text += f"Page: {doc.metadata['page']}\n"
-                chunk_text += f"Content: {doc.page_content}\n"
-                raw_context_blocks.append(chunk_text)
-        else:
-            # Fallback: split context by double newlines
-            chunks = context.split('\n\n')
-            raw_context_blocks = [
-                f"[Chunk {i}]\nContent: {chunk.strip()}\n"
-                for i, chunk in enumerate(chunks) if chunk.strip()
-            ]
+
+    # Collect chunk ids from every tool call (the agent may reformulate the
+    # query several times), then the session's previously kept chunks,
+    # keeping first-seen order and dropping duplicates
+    chunk_ids: List[str] = []
+    retrieved = [
+        cid
+        for msg in messages
+        if isinstance(msg, ToolMessage) and isinstance(msg.artifact, list)
+        for cid in msg.artifact
+    ]
+    for cid in retrieved + [record.chunk_id for record in carried]:
+        if cid not in chunk_ids:
+            chunk_ids.append(cid)
 
     return {
-        "context": context,
-        "raw_docs": raw_docs,
-        "raw_context_blocks": raw_context_blocks,
+        "chunk_ids": chunk_ids,
+        "metrics": {
+            "retrieval": _usage_metrics(messages, started, model_name or settings.openai_model_name),
+        },
     }
 
+def _critique_chunks(
+    question  : str,
+    records   : List[ChunkRecord],
+    indices   : List[int],
+    model_name: str | None = None,
+) -> Tuple[Dict[str, Any], List[object]]:
+    """Ask the Context Critic Agent to assess `records[i]` for every i in `indices`.
+
+    Chunks keep their retrieval-time numbers, so the returned `chunk_id`s index
+    into `records`. If the response cannot be parsed, every assessed chunk is
+    kept as MARGINAL.
+
+    Returns:
+        Tuple of (parsed assessment dict, agent messages).
+    """
+    # Prepare chunks for evaluation, rendered straight from the chunk store
+    chunks_text = format_chunk_blocks(
+        [records[i] for i in indices],
+        header="=== CHUNK {index} ===\n",
+        indices=indices,
+    )
+    
+    # Create the user message for the critic agent: static instructions
+    # first (cacheable), then the chunks, then the question
+    user_message = f"""{CONTEXT_CRITIC_OUTPUT_INSTRUCTIONS}
+
+Retrieved Chunks to Evaluate:
+{chunks_text}
+
+Question: {question}"""
+    
+    # Invoke the Context Critic Agent (proper agent invocation)
+    agent = _agent_for("context_critic", model_name) if model_name else context_critic_agent
+    result = agent.invoke(
+        {"messages": [HumanMessage(content=user_message)]}
+    )
+    
+    # Extract the agent's response
+    messages = result.get("messages", [])
+    response_content = _extract_last_ai_content(messages)
+    
+    # Parse JSON response
+    try:
+        # Extract JSON from response (handle markdown code blocks)
+        content = response_content.strip()
+        if "```json" in content:
+            content = content.split("```json")[1].split("```")[0].strip()
+        elif "```" in content:
+            content = content.split("```")[1].split("```")[0].strip()
+        
+        assessment = json.loads(content)
+    except json.JSONDecodeError as e:
+        print(f"JSON parsing error: {e}")
+        print(f"Raw response: {response_content}")
+        # Fallback: keep all chunks if parsing fails
+        assessment = {
+            "chunks": [
+                {
+                    "chunk_id": i,
+                    "relevance": "MARGINAL",
+                    "rationale": "Parsing error - kept by default",
+                    "keep": True
+                }
+                for i in indices
+            ],
+            "summary": "JSON parsing failed - kept all chunks",
+            "filtered_count": len(indices)
+        }
+    
+    return assessment, messages
+
 def context_critic_node(state: QAState) -> dict:
     """Context Critic Agent node: filters and ranks retrieved chunks using the agent.
     
@@ -142,81 +373,52 @@ def context_critic_node(state: QAState) -> dict:
     - Agent assigns relevance scores and provides rationales
     - Filters out irrelevant chunks
     - Reorders chunks by relevance
-    - Updates context with filtered chunks
+    - Stores the kept chunk ids (the context is rendered from them later)
+    - Reuses session verdicts (`cached_assessments`) for carried-over chunks and
+      repeated questions, so only newly retrieved chunks are assessed
     """
     question = state["question"]
-    raw_context_blocks = state.get("raw_context_blocks", [])
+    records = get_chunk_store().get_many(state.get("chunk_ids") or [])
     
-    if not raw_context_blocks:
+    if not records:
         return {
             "context_rationale": "No chunks retrieved to evaluate",
-            "chunk_relevance_scores": []
+            "chunk_relevance_scores": [],
+            "kept_chunk_ids": [],
         }
     
-    # Prepare chunks for evaluation
-    chunks_text = "\n\n".join([
-        f"=== CHUNK {i} ===\n{chunk}"
-        for i, chunk in enumerate(raw_context_blocks)
-    ])
-    
-    # Create the user message for the critic agent
-    user_message = f"""Question: {question}
-
-Retrieved Chunks to Evaluate:
-{chunks_text}
-
-Analyze each chunk and provide your assessment in the following JSON format:
-{{
-    "chunks": [
-        {{
-            "chunk_id": 0,
-            "relevance": "HIGHLY_RELEVANT|MARGINAL|IRRELEVANT",
-            "rationale": "Brief explanation",
-            "keep": true|false
-        }}
-    ],
-    "summary": "Overall assessment of retrieval quality",
-    "filtered_count": number_of_chunks_to_keep
-}}"""
+    # Verdicts the session already has are reused; only chunks without one
+    # are sent to the critic
+    cached = state.get("cached_assessments") or {}
+    new_indices = [i for i, record in enumerate(records) if record.chunk_id not in cached]
     
+    started = time.perf_counter()
+    messages: List[object] = []
+    critic_model_name = (state.get("pipeline") or {}).get("critic_model_name")
     try:
-        # Invoke the Context Critic Agent (proper agent invocation)
-        result = context_critic_agent.invoke(
-            {"messages": [HumanMessage(content=user_message)]}
-        )
-        
-        # Extract the agent's response
-        messages = result.get("messages", [])
-        response_content = _extract_last_ai_content(messages)
-        
-        # Parse JSON response
-        try:
-            # Extract JSON from response (handle markdown code blocks)
-            content = response_content.strip()
-            if "```json" in content:
-                content = content.split("```json")[1].split("```")[0].strip()
-            elif "```" in content:
-                content = content.split("```")[1].split("```")[0].strip()
-            
-            assessment = json.loads(content)
-        except json.JSONDecodeError as e:
-            print(f"JSON parsing error: {e}")
-            print(f"Raw response: {response_content}")
-            # Fallback: keep all chunks if parsing fails
+        if new_indices:
+            assessment, messages = _critique_chunks(
+                question, records, new_indices,
+                model_name=critic_model_name,
+            )
+        else:
             assessment = {
-                "chunks": [
-                    {
-                        "chunk_id": i,
-                        "relevance": "MARGINAL",
-                        "rationale": "Parsing error - kept by default",
-                        "keep": True
-                    }
-                    for i in range(len(raw_context_blocks))
-                ],
-                "summary": "JSON parsing failed - kept all chunks",
-                "filtered_count": len(raw_context_blocks)
+                "chunks": [],
+                "summary": "All chunks were assessed earlier in this session - reused cached verdicts",
             }
         
+        # Merge in cached verdicts for previously assessed chunks
+        assessment_chunks = [
+            chunk for chunk in assessment.get("chunks", [])
+            if isinstance(chunk.get("chunk_id"), int) and 0 <= chunk["chunk_id"] < len(records)
+        ]
+        assessment_chunks += [
+            {"chunk_id": i, **cached[record.chunk_id], "cached": True}
+            for i, record in enumerate(records)
+            if record.chunk_id in cached
+        ]
+        assessment["chunks"] = assessment_chunks
+        
         # Filter and reorder chunks
         chunk_scores = assessment.get("chunks", [])
         
@@ -228,23 +430,22 @@ Analyze each chunk and provide your assessment in the following JSON format:
         )
         
         # Filter chunks marked to keep
-        kept_chunks = [
-            raw_context_blocks[chunk["chunk_id"]]
+        kept_indices = [
+            chunk["chunk_id"]
             for chunk in chunk_scores_sorted
-            if chunk.get("keep", False) and chunk["chunk_id"] < len(raw_context_blocks)
+            if chunk.get("keep", False) and chunk["chunk_id"] < len(records)
         ]
-        
-        # Create filtered context
-        filtered_context = "\n\n".join(kept_chunks) if kept_chunks else state.get("context", "")
+        kept_records = [records[i] for i in kept_indices]
         
         # Create human-readable rationale summary
         rationale_lines = [
             f"Context Critic Analysis for Question: \"{question}\"",
             "",
             f"📊 Statistics:",
-            f"   • Retrieved: {len(raw_context_blocks)} chunks",
-            f"   • Kept: {len(kept_chunks)} chunks",
-            f"   • Filtered: {len(raw_context_blocks) - len(kept_chunks)} chunks",
+            f"   • Retrieved: {len(records)} chunks",
+            f"   • Reused from session: {len(records) - len(new_indices)} chunks",
+            f"   • Kept: {len(kept_records)} chunks",
+            f"   • Filtered: {len(records) - len(kept_records)} chunks",
             "",
             "📝 Chunk-by-Chunk Analysis:",
             ""
@@ -272,79 +473,129 @@ Analyze each chunk and provide your assessment in the following JSON format:
         rationale_lines.append("📋 Overall Assessment:")
         rationale_lines.append(f"   {assessment.get('summary', 'No summary provided')}")
         rationale_lines.append("")
-        rationale_lines.append(f"✨ Filtered Context: Keeping {len(kept_chunks)} most relevant chunks")
+        rationale_lines.append(f"✨ Filtered Context: Keeping {len(kept_records)} most relevant chunks")
         
         context_rationale = "\n".join(rationale_lines)
         
         return {
-            "context": filtered_context,
             "context_rationale": context_rationale,
-            "chunk_relevance_scores": chunk_scores_sorted
+            "chunk_relevance_scores": chunk_scores_sorted,
+            "kept_chunk_ids": [record.chunk_id for record in kept_records],
+            "chunk_assessments": {
+                records[chunk["chunk_id"]].chunk_id: {
+                    "relevance": chunk.get("relevance", "MARGINAL"),
+                    "rationale": chunk.get("rationale", ""),
+                    "keep"     : bool(chunk.get("keep", False)),
+                }
+                for chunk in chunk_scores_sorted
+            },
+            "metrics": {"context_critic": _usage_metrics(
+                messages, started, critic_model_name or get_settings().openai_critic_model_name,
+            )},
         }
         
     except Exception as e:
-        # Error handling: log and pass through original context
+        # Transient provider errors are retried by the graph's retry policy
+        if is_transient_error(e):
+            raise
+        # Error handling: log and keep every retrieved chunk
         print(f"Context Critic Agent Error: {str(e)}")
         import traceback
         traceback.print_exc()
         return {
-            "context"               : state.get("context", ""),
             "context_rationale"     : f"Critic agent error: {str(e)}. Using original context.",
-            "chunk_relevance_scores": []
+            "chunk_relevance_scores": [],
+            "kept_chunk_ids"        : [record.chunk_id for record in records],
         }
 
 def summarization_node(state:QAState) -> QAState: 
     """Summarization Agent node: generates draft answer from context.
 
     This node:
-    - Sends question + context to the Summarization Agent.
+    - Sends context, then task instructions + question, to the Summarization Agent.
     - Agent responds with a draft answer grounded only in the context.
     - Stores the draft answer in `state["draft_answer"]`.
+    - If a capped draft was cut off and the router left a fallback tier,
+      regenerates it there and switches verification to that tier too.
     """
 
     question = state["question"]
-    context  = state.get("context")
-    
-    user_content = f"Question: {question}\n\nContext:\n{context}" 
+    context  = render_context(state)
+    started  = time.perf_counter()
+
+    task = f"{SUMMARIZATION_INSTRUCTIONS}\nQuestion: {question}"
 
-    result = summarization_agent.invoke(
-        {"messages": [HumanMessage(content=user_content)]}
+    agent, model_name, tier = _answer_agent("summarization", state)
+    result = agent.invoke(
+        {"messages": _grounded_messages(context, task)}
     )
     messages     = result.get("messages", [])
     draft_answer = _extract_last_ai_content(messages)
+    metrics      = {"summarization": {**_usage_metrics(messages, started, model_name), "tier": tier}}
+
+    fallback = (state.get("route") or {}).get("fallback")
+    if not (fallback and _hit_output_limit(messages)):
+        return {"draft_answer": draft_answer, "metrics": metrics}
+
+    metrics["summarization"]["truncated"] = True
+    # The rerun and the verification that follows it are calls on the fallback models
+    reserve_calls(fallback["summarization"]["model_name"], 1)
+    reserve_calls(fallback["verification"]["model_name"], 1)
+
+    started = time.perf_counter()
+    choice  = fallback["summarization"]
+    result  = _agent_for("summarization", choice["model_name"], choice["max_tokens"]).invoke(
+        {"messages": _grounded_messages(context, task)}
+    )
+    messages = result.get("messages", [])
+    metrics["summarization_rerun"] = {
+        **_usage_metrics(messages, started, choice["model_name"]),
+        "tier": fallback["tier"],
+    }
 
     return {
-        "draft_answer": draft_answer,
+        "draft_answer": _extract_last_ai_content(messages),
+        "route"       : {**state["route"], **fallback, "fallback": None},
+        "metrics"     : metrics,
     }
 
 def verification_node(state: QAState) -> QAState: 
     """Verification Agent node: verifies and corrects the draft answer.
 
     This node:
-    - Sends question + context + draft_answer to the Verification Agent.
+    - Sends context, then task instructions + question + draft_answer, to the
+      Verification Agent (same prefix as summarization for prompt caching).
     - Agent checks for hallucinations and unsupported claims.
-    - Stores the final verified answer in `state["answer"]`.
+    - Stores the final verified answer in `state["answer"]`, or the draft
+      if the verified answer was cut off by its output budget.
     """
     question = state["question"]
-    context = state.get("context", "")
+    context = render_context(state)
     draft_answer = state.get("draft_answer", "")
+    started = time.perf_counter()
 
-    user_content = f"""Question: {question}
-
-Context:
-{context}
+    task = f"""{VERIFICATION_INSTRUCTIONS}
+Question: {question}
 
 Draft Answer:
 {draft_answer}
 
 Please verify and correct the draft answer, removing any unsupported claims."""
 
-    result = verification_agent.invoke(
-        {"messages": [HumanMessage(content=user_content)]}
+    agent, model_name, tier = _answer_agent("verification", state)
+    result = agent.invoke(
+        {"messages": _grounded_messages(context, task)}
     )
     messages = result.get("messages", [])
     answer = _extract_last_ai_content(messages)
+    metrics = {**_usage_metrics(messages, started, model_name), "tier": tier}
+
+    # A truncated rewrite would drop the end of the answer: keep the full draft
+    if _hit_output_limit(messages):
+        answer = draft_answer
+        metrics["truncated"] = True
 
     return {
         "answer": answer,
+        "metrics": {"verification": metrics},
     }
\ No newline at end of file
@@ -0,0 +1,151 @@
+"""Run checkpoints and the request-id registry, shared by all serving workers.
+
+QA runs that carry a request id are checkpointed after every node, so that
+a retry of a failed request resumes where it stopped instead of paying for
+the completed agents again. The checkpoints (LangGraph's `SqliteSaver`) and
+the registry of running and failed runs live in one SQLite file in WAL mode
+(`QA_CHECKPOINT_PATH`), so any worker can resume a failed run or reject a
+request id that another worker is still running.
+"""
+
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+from functools import lru_cache
+from pathlib import Path
+from typing import Iterator, List
+
+from langgraph.checkpoint.sqlite import SqliteSaver
+
+from ..config import get_settings
+
+RUNNING = "running"
+FAILED = "failed"
+
+
+class RunConflict(Exception):
+    """Raised when a request id is reused for a different or still-running request."""
+
+
+def _connect(path: Path, check_same_thread: bool = True) -> sqlite3.Connection:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    conn = sqlite3.connect(str(path), timeout=5.0, check_same_thread=check_same_thread)
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=NORMAL")
+    return conn
+
+
+class RunRegistry:
+    """Cross-process record of the request ids that are running or failed.
+
+    Every id maps to its run's status and input fingerprint. Claims run in a
+    write transaction, so two workers can never run the same id at once. A
+    run still marked as running after `lease_seconds` is treated as
+    abandoned (its worker died) and can be claimed again.
+    """
+
+    def __init__(self, path: Path, max_failed: int, lease_seconds: float):
+        self.path = Path(path)
+        self.max_failed = max_failed
+        self.lease_seconds = lease_seconds
+        self._local = threading.local()
+
+        with self._transaction() as conn:
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS runs ("
+                " thread_id   TEXT PRIMARY KEY,"
+                " fingerprint TEXT NOT NULL,"
+                " status      TEXT NOT NULL,"
+                " updated_at  REAL NOT NULL)"
+            )
+
+    @contextmanager
+    def _transaction(self) -> Iterator[sqlite3.Connection]:
+        # SQLite connections must not be shared between threads
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = self._local.conn = _connect(self.path)
+
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            yield conn
+        except BaseException:
+            conn.rollback()
+            raise
+        conn.commit()
+
+    def claim(self, thread_id: str, fingerprint: str) -> bool:
+        """Mark a run as running; returns whether it holds a run to resume.
+
+        Raises:
+            RunConflict: The run is still in progress, or an earlier run with
+                this id was started with a different input.
+        """
+        now = time.time()
+        with self._transaction() as conn:
+            row = conn.execute(
+                "SELECT fingerprint, status, updated_at FROM runs WHERE thread_id = ?",
+                (thread_id,),
+            ).fetchone()
+            if row is not None:
+                stored, status, updated_at = row
+                if status == RUNNING and now - updated_at < self.lease_seconds:
+                    raise RunConflict(f"Request {thread_id} is already in progress")
+                if stored != fingerprint:
+                    raise RunConflict(
+                        f"Request {thread_id} was already used for a different question, scope or session"
+                    )
+            conn.execute(
+                "INSERT OR REPLACE INTO runs (thread_id, fingerprint, status, updated_at) VALUES (?, ?, ?, ?)",
+                (thread_id, fingerprint, RUNNING, now),
+            )
+        return row is not None
+
+    def fail(self, thread_id: str, fingerprint: str) -> List[str]:
+        """Keep a failed run for resumption.
+
+        Returns:
+            The ids of the oldest failed (or abandoned) runs beyond
+            `max_failed`, which are dropped from the registry; their
+            checkpoints should be deleted.
+        """
+        now = time.time()
+        with self._transaction() as conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO runs (thread_id, fingerprint, status, updated_at) VALUES (?, ?, ?, ?)",
+                (thread_id, fingerprint, FAILED, now),
+            )
+            stale = [
+                row[0]
+                for row in conn.execute(
+                    "SELECT thread_id FROM runs WHERE status = ? OR updated_at < ?"
+                    " ORDER BY updated_at DESC LIMIT -1 OFFSET ?",
+                    (FAILED, now - self.lease_seconds, self.max_failed),
+                )
+            ]
+            conn.executemany("DELETE FROM runs WHERE thread_id = ?", [(stale_id,) for stale_id in stale])
+        return stale
+
+    def release(self, thread_id: str) -> None:
+        """Forget a run that no longer needs to be resumed."""
+        with self._transaction() as conn:
+            conn.execute("DELETE FROM runs WHERE thread_id = ?", (thread_id,))
+
+
+@lru_cache(maxsize=1)
+def get_checkpointer() -> SqliteSaver:
+    """Get this process's handle on the QA checkpoints (singleton via LRU cache)."""
+    # The saver serializes its own access to the connection
+    return SqliteSaver(_connect(Path(get_settings().qa_checkpoint_path), check_same_thread=False))
+
+
+@lru_cache(maxsize=1)
+def get_run_registry() -> RunRegistry:
+    """Get this process's handle on the run registry (singleton via LRU cache)."""
+    settings = get_settings()
+    return RunRegistry(
+        path          = Path(settings.qa_checkpoint_path),
+        max_failed    = settings.qa_checkpoint_max_threads,
+        lease_seconds = settings.qa_run_lease_seconds,
+    )
@@ -1,48 +1,193 @@
 """LangGraph orchestration for the linear multi-agent QA flow."""
 
+import hashlib
+import json
 from functools import lru_cache
-from typing import Any, Dict
+from typing import Any, Dict, Iterator, Optional
 
 from langgraph.constants import END, START
 from langgraph.graph import StateGraph
+from langgraph.types import RetryPolicy
+from openai import RateLimitError
 
-from .agents import retrieval_node, context_critic_node, summarization_node, verification_node
-from .state import QAState
+from ..config import get_settings
+from ..llm.factory import is_transient_error
+from ..llm.rate_limits import report_rate_limited
+from .agents import (
+    context_critic_node,
+    render_context,
+    retrieval_node,
+    summarization_node,
+    verification_node,
+)
+from .checkpoints import RunConflict, get_checkpointer, get_run_registry
+from .routing import router_node, validate_pipeline_tier
+from .state import PipelineOptions, QAState
+from .streaming import stream_verified_answer
 
-def create_qa_graph() -> Any: 
+def _retry_on(exc: Exception) -> bool:
+    """Retry transient OpenAI errors, reporting 429s to admission control."""
+    if isinstance(exc, RateLimitError):
+        report_rate_limited(exc)
+    return is_transient_error(exc)
+
+def _node_retry_policy() -> RetryPolicy:
+    """Per-node retry with exponential backoff on transient OpenAI errors."""
+    settings = get_settings()
+    return RetryPolicy(
+        initial_interval = settings.qa_node_retry_initial_interval,
+        backoff_factor   = 2.0,
+        max_attempts     = settings.qa_node_max_attempts,
+        retry_on         = _retry_on,
+    )
+
+def _route_after_retrieval(state: QAState) -> str:
+    """Skip the Context Critic when the run's pipeline options disable it."""
+    if (state.get("pipeline") or {}).get("use_critic", True):
+        return "context_critic"
+    return "router"
+
+def create_qa_graph(checkpointer: Optional[Any] = None) -> Any: 
     """Create and compile the linear multi-agent QA graph.
 
     The graph executes in order:
     1. Retrieval Agent: gathers context from vector store
-    2. Summarization Agent: generates draft answer from context
-    3. Verification Agent: verifies and corrects the answer
+    2. Context Critic Agent: filters the retrieved chunks (optional)
+    3. Router: picks the model tier for the answering agents (no LLM call)
+    4. Summarization Agent: generates draft answer from context
+    5. Verification Agent: verifies and corrects the answer
+
+    Every node retries transient OpenAI errors with backoff. With a
+    `checkpointer`, state is saved after each node so that a failed run
+    can be resumed from the last completed node.
 
     Returns:
         Compiled graph ready for execution.
     """
     builder = StateGraph(QAState)
+    retry_policy = _node_retry_policy()
 
     # Add nodes for each agent
-    builder.add_node("retrieval", retrieval_node)
-    builder.add_node("context_critic", context_critic_node)
-    builder.add_node("summarization", summarization_node)
-    builder.add_node("verification", verification_node)
+    builder.add_node("retrieval", retrieval_node, retry_policy=retry_policy)
+    builder.add_node("context_critic", context_critic_node, retry_policy=retry_policy)
+    builder.add_node("router", router_node)
+    builder.add_node("summarization", summarization_node, retry_policy=retry_policy)
+    builder.add_node("verification", verification_node, retry_policy=retry_policy)
 
-    # Define linear flow: START -> retrieval -> summarization -> verification -> END
+    # Define flow: START -> retrieval -> [context_critic] -> router -> summarization -> verification -> END
     builder.add_edge(START, "retrieval")
-    builder.add_edge("retrieval", "context_critic")  
-    builder.add_edge("context_critic", "summarization") 
+    builder.add_conditional_edges(
+        "retrieval", _route_after_retrieval, ["context_critic", "router"]
+    )
+    builder.add_edge("context_critic", "router")
+    builder.add_edge("router", "summarization")
     builder.add_edge("summarization", "verification")
     builder.add_edge("verification", END)
 
+    return builder.compile(checkpointer=checkpointer)
+
+def create_context_graph() -> Any:
+    """Create and compile the context-only graph used for streaming answers.
+
+    Runs Retrieval -> Context Critic; summarization and verification are
+    then performed incrementally by `stream_verified_answer`.
+
+    Returns:
+        Compiled graph ready for execution.
+    """
+    builder = StateGraph(QAState)
+    retry_policy = _node_retry_policy()
+
+    builder.add_node("retrieval", retrieval_node, retry_policy=retry_policy)
+    builder.add_node("context_critic", context_critic_node, retry_policy=retry_policy)
+
+    builder.add_edge(START, "retrieval")
+    builder.add_edge("retrieval", "context_critic")
+    builder.add_edge("context_critic", END)
+
     return builder.compile()
 
 @lru_cache(maxsize=1)
 def get_qa_graph() -> Any:
-    """Get the compiled QA graph instance (singleton via LRU cache)."""
+    """Get the compiled, checkpointed QA graph instance (singleton via LRU cache)."""
+    return create_qa_graph(checkpointer=get_checkpointer())
+
+@lru_cache(maxsize=1)
+def _get_unchecked_qa_graph() -> Any:
+    """QA graph for runs without a request id, which can never be resumed."""
     return create_qa_graph()
 
-def run_qa_flow(question: str) -> Dict[str, Any]: 
+def _input_fingerprint(
+    question : str,
+    namespace: Optional[str],
+    filters  : Optional[Dict[str, Any]],
+    session  : Optional[Dict[str, Any]],
+    pipeline : Optional[PipelineOptions],
+) -> str:
+    """Hash of everything that shapes a run's result."""
+    payload = json.dumps(
+        {
+            "question" : question,
+            "namespace": namespace,
+            "filters"  : filters,
+            "session"  : session,
+            "pipeline" : pipeline,
+        },
+        sort_keys=True,
+        default=str,
+    )
+    return hashlib.sha1(payload.encode("utf-8")).hexdigest()
+
+def _retain_failed_thread(thread_id: str, fingerprint: str) -> None:
+    """Keep a failed run's checkpoints, dropping the oldest beyond the cap."""
+    for stale in get_run_registry().fail(thread_id, fingerprint):
+        get_checkpointer().delete_thread(stale)
+
+def _release_thread(thread_id: str) -> None:
+    """Drop a run's checkpoints once it no longer needs to be resumed."""
+    get_run_registry().release(thread_id)
+    get_checkpointer().delete_thread(thread_id)
+
+@lru_cache(maxsize=1)
+def get_context_graph() -> Any:
+    """Get the compiled context-only graph instance (singleton via LRU cache)."""
+    return create_context_graph()
+
+def _initial_state(
+    question : str,
+    namespace: Optional[str],
+    filters  : Optional[Dict[str, Any]],
+    session  : Optional[Dict[str, Any]] = None,
+    pipeline : Optional[PipelineOptions] = None,
+) -> QAState:
+    session = session or {}
+    return {
+        "question"              : question,
+        "draft_answer"          : None,
+        "answer"                : None,
+        "namespace"             : namespace,
+        "filters"               : filters,
+        "pipeline"              : pipeline,
+        "chunk_ids"             : None,
+        "kept_chunk_ids"        : None,
+        "context_rationale"     : None,       # NEW
+        "chunk_relevance_scores": None,       # NEW
+        "history"               : session.get("history"),
+        "session_chunk_ids"     : session.get("session_chunk_ids"),
+        "cached_assessments"    : session.get("cached_assessments"),
+        "chunk_assessments"     : None,
+        "route"                 : None,
+        "metrics"               : {},
+    }
+
+def run_qa_flow(
+    question  : str,
+    namespace : Optional[str] = None,
+    filters   : Optional[Dict[str, Any]] = None,
+    session   : Optional[Dict[str, Any]] = None,
+    pipeline  : Optional[PipelineOptions] = None,
+    request_id: Optional[str] = None,
+) -> Dict[str, Any]: 
     """Run the complete multi-agent QA flow for a question.
 
     This is the main entry point for the QA system. It:
@@ -50,28 +195,96 @@ def run_qa_flow(question: str) -> Dict[str, Any]:
     2. Executes the linear agent flow (Retrieval -> Summarization -> Verification)
     3. Extracts and returns the final results
 
+    Runs with a `request_id` are checkpointed (see `checkpoints.py`). If an
+    earlier run with the same id failed part-way (after the in-graph retries
+    were exhausted), it is resumed from the last completed node instead of
+    starting over - in any serving worker - so the LLM calls that already
+    succeeded are not paid for again. Only a run with the same question,
+    namespace, filters, session and pipeline options is resumed. Runs
+    without a request id are not checkpointed.
+
     Args:
         question: The user's question about the vector databases paper.
+        namespace: Collection/tenant namespace to retrieve from.
+        filters: Optional Pinecone metadata filter narrowing retrieval.
+        session: Prior-turn data for follow-up questions, with optional
+            `history`, `session_chunk_ids` and `cached_assessments` keys.
+        pipeline: Optional per-run overrides (skip the critic, retrieval k,
+            models), see `PipelineOptions`.
+        request_id: Idempotency key of the request; retries of a failed
+            request should reuse it to resume the run.
+
+    Raises:
+        ValueError: `pipeline` forces an unknown `model_tier`.
+        RunConflict: `request_id` belongs to a run that is still in progress,
+            or to a failed run with a different input.
 
     Returns:
         Dictionary with keys:
         - `answer`: Final verified answer
         - `draft_answer`: Initial draft answer from summarization agent
-        - `context`: Retrieved context from vector store
+        - `context`: Context the answer was grounded in, rendered from the
+          chunk store once the run finished
+        - `metrics`: Per-node token usage (incl. cached prompt tokens) and latency
+        - `kept_chunk_ids` / `chunk_assessments`: Critic output by chunk id
     """
+    validate_pipeline_tier(pipeline)
+    initial_state = _initial_state(question, namespace, filters, session, pipeline)
+
+    if not request_id:
+        final_state = _get_unchecked_qa_graph().invoke(initial_state)
+        return {**final_state, "context": render_context(final_state)}
+
     graph = get_qa_graph()
+    config = {"configurable": {"thread_id": request_id}}
+    fingerprint = _input_fingerprint(question, namespace, filters, session, pipeline)
 
-    initial_state: QAState = {
-        "question"              : question,
-        "context"               : None,
-        "draft_answer"          : None,
-        "answer"                : None,
-        "raw_docs"              : None,       # NEW
-        "raw_context_blocks"    : None,       # NEW
-        "context_rationale"     : None,       # NEW
-        "chunk_relevance_scores": None,       # NEW
-    }
+    if get_run_registry().claim(request_id, fingerprint) and graph.get_state(config).next:
+        # An earlier attempt stopped part-way: continue from its checkpoint
+        graph_input = None
+    else:
+        graph_input = initial_state
+
+    try:
+        final_state = graph.invoke(graph_input, config)
+    except BaseException:
+        _retain_failed_thread(request_id, fingerprint)
+        raise
+
+    _release_thread(request_id)
+    return {**final_state, "context": render_context(final_state)}
+
+def stream_qa_flow(
+    question : str,
+    namespace: Optional[str] = None,
+    filters  : Optional[Dict[str, Any]] = None,
+) -> Iterator[Dict[str, Any]]:
+    """Run the QA flow with summarization and verification overlapped.
+
+    Retrieval and the Context Critic run as usual; the answer is then
+    streamed and verified sentence by sentence.
 
-    final_state = graph.invoke(initial_state)
+    Args:
+        question: The user's question about the vector databases paper.
+        namespace: Collection/tenant namespace to retrieve from.
+        filters: Optional Pinecone metadata filter narrowing retrieval.
+
+    Yields:
+        A `context` event with the critic's output, one `sentence` event per
+        drafted sentence, and a final `answer` event (see
+        `stream_verified_answer`) whose metrics include retrieval and critic.
+    """
+    state = get_context_graph().invoke(_initial_state(question, namespace, filters))
+    context = render_context(state)
+
+    yield {
+        "type"                  : "context",
+        "context"               : context,
+        "context_rationale"     : state.get("context_rationale"),
+        "chunk_relevance_scores": state.get("chunk_relevance_scores"),
+    }
 
-    return final_state
+    for event in stream_verified_answer(question, context):
+        if event["type"] == "answer":
+            event["metrics"] = {**state.get("metrics", {}), **event["metrics"]}
+        yield event
@@ -0,0 +1,150 @@
+"""Model routing by question difficulty.
+
+After retrieval (and the Context Critic), the router estimates how hard the
+question is from cheap signals - no LLM call:
+
+- context size (characters of the context the answer will be grounded in),
+- the critic's verdicts (clearly relevant chunks vs. marginal ones),
+- question features (length, multi-hop / synthesis wording).
+
+Easy questions - short lookups answered by one or two clearly relevant
+chunks - take the `fast` tier: a smaller model and tighter output budgets for
+summarization and verification. Everything else takes the `standard` tier.
+A fast-tier draft cut off by its output budget is regenerated, and then
+verified, on the standard tier.
+
+The router also reserves the summarization and verification calls on the
+chosen model with admission control, which cannot know it up front.
+"""
+
+import re
+import time
+from typing import Any, Dict, List, Optional, Tuple
+
+from ..config import get_settings
+from ..llm.rate_limits import reserve_calls
+from .agents import render_context
+from .state import QAState
+
+FAST_TIER = "fast"
+STANDARD_TIER = "standard"
+TIERS = (FAST_TIER, STANDARD_TIER)
+ANSWER_ROLES = ("summarization", "verification")
+
+# Wording that usually signals comparison, causal or multi-part synthesis
+_COMPLEX_QUESTION = re.compile(
+    r"\b(compare|comparison|contrast|difference|differences|versus|vs|why|explain|"
+    r"relationship|relate|impact|trade-?offs?|pros|cons|advantages|disadvantages|"
+    r"summari[sz]e|overview|all|each|steps)\b",
+    re.IGNORECASE,
+)
+
+
+def classify_difficulty(
+    question    : str,
+    context     : str,
+    chunk_scores: Optional[List[dict]],
+) -> Tuple[str, List[str]]:
+    """Pick a model tier for a question and its (filtered) context.
+
+    Args:
+        question: The user's question.
+        context: Context the answer will be grounded in.
+        chunk_scores: Critic verdicts (`relevance`, `keep`) or None when the
+            critic did not run.
+
+    Returns:
+        `(tier, reasons)`, where `reasons` lists the signals that ruled out
+        the fast tier (empty for the fast tier).
+    """
+    settings = get_settings()
+    reasons: List[str] = []
+
+    if len(context) > settings.routing_fast_max_context_chars:
+        reasons.append(f"context has {len(context)} chars")
+
+    words = len(question.split())
+    if words > settings.routing_fast_max_question_words:
+        reasons.append(f"question has {words} words")
+    if _COMPLEX_QUESTION.search(question) or question.count("?") > 1:
+        reasons.append("question asks for comparison or synthesis")
+
+    if chunk_scores is None:
+        reasons.append("no critic verdicts")
+    else:
+        kept = [chunk for chunk in chunk_scores if chunk.get("keep")]
+        highly_relevant = [chunk for chunk in kept if chunk.get("relevance") == "HIGHLY_RELEVANT"]
+        if not highly_relevant:
+            reasons.append("no clearly relevant chunk")
+        elif len(kept) - len(highly_relevant) > len(highly_relevant):
+            reasons.append("mostly marginal chunks")
+
+    return (STANDARD_TIER if reasons else FAST_TIER), reasons
+
+
+def tier_models(tier: str) -> Dict[str, Dict[str, Any]]:
+    """Model and output budget (None: uncapped) per answering node for a tier."""
+    settings = get_settings()
+    if tier == FAST_TIER:
+        return {
+            "summarization": {"model_name": settings.openai_fast_model_name, "max_tokens": settings.fast_summarization_max_tokens},
+            "verification" : {"model_name": settings.openai_fast_model_name, "max_tokens": settings.fast_verification_max_tokens},
+        }
+    return {
+        "summarization": {"model_name": settings.openai_model_name, "max_tokens": settings.standard_summarization_max_tokens},
+        "verification" : {"model_name": settings.openai_model_name, "max_tokens": settings.standard_verification_max_tokens},
+    }
+
+
+def validate_pipeline_tier(pipeline: Optional[Dict[str, Any]]) -> None:
+    """Reject a forced `model_tier` that is not a known tier.
+
+    Raises:
+        ValueError: `pipeline["model_tier"]` is set to an unknown tier.
+    """
+    tier = (pipeline or {}).get("model_tier")
+    if tier and tier not in TIERS:
+        raise ValueError(f"Unknown model_tier {tier!r}; expected one of {', '.join(TIERS)}")
+
+def router_node(state: QAState) -> dict:
+    """Router node: choose the model tier for summarization and verification.
+
+    A run's `pipeline` options can force a tier (`model_tier`) or bypass
+    routing entirely by pinning `model_name`.
+    """
+    started = time.perf_counter()
+    settings = get_settings()
+    pipeline = state.get("pipeline") or {}
+
+    if pipeline.get("model_name") or not settings.model_routing_enabled:
+        reserve_calls(pipeline.get("model_name") or settings.openai_model_name, len(ANSWER_ROLES))
+        return {"route": None}
+
+    if pipeline.get("model_tier"):
+        tier, reasons = pipeline["model_tier"], ["forced by pipeline options"]
+    else:
+        # Without the critic there are no verdicts to go on
+        chunk_scores = state.get("chunk_relevance_scores") if pipeline.get("use_critic", True) else None
+        tier, reasons = classify_difficulty(
+            state["question"],
+            render_context(state),
+            chunk_scores,
+        )
+
+    route = {"tier": tier, "reasons": reasons, **tier_models(tier)}
+    for role in ANSWER_ROLES:
+        reserve_calls(route[role]["model_name"], 1)
+    if tier != STANDARD_TIER:
+        # Taken over by summarization if the draft hits its output budget
+        route["fallback"] = {"tier": STANDARD_TIER, **tier_models(STANDARD_TIER)}
+
+    return {
+        "route"  : route,
+        "metrics": {
+            "router": {
+                "tier"      : tier,
+                "reasons"   : reasons,
+                "latency_ms": round((time.perf_counter() - started) * 1000, 3),
+            },
+        },
+    }
@@ -1,21 +1,46 @@
 """LangGraph state schema for the multi-agent QA flow."""
 
-from typing import TypedDict, List, Optional
-from langchain_core.documents import Document
+from typing import Annotated, Any, Dict, TypedDict, List, Optional
+
+class PipelineOptions(TypedDict, total=False):
+    """Per-run overrides of the pipeline configuration."""
+    use_critic       : bool  # Run the Context Critic (default True)
+    retrieval_k      : int   # Chunks per retrieval tool call
+    model_name       : str   # Model for retrieval/summarization/verification
+    critic_model_name: str   # Model for the Context Critic
+    model_tier       : str   # Force the router's tier ("fast" or "standard")
+
+def merge_metrics(
+    left : Optional[Dict[str, Dict[str, Any]]],
+    right: Optional[Dict[str, Dict[str, Any]]],
+) -> Dict[str, Dict[str, Any]]:
+    """Reducer letting each node add its own entry to `metrics`."""
+    return {**(left or {}), **(right or {})}
 
 class QAState(TypedDict): 
     """State schema for the linear multi-agent QA flow.
 
     The state flows through three agents:
-    1. Retrieval Agent: populates `context` from `question`
-    2. Summarization Agent: generates `draft_answer` from `question` + `context`
-    3. Verification Agent: produces final `answer` from `question` + `context` + `draft_answer`
+    1. Retrieval Agent: populates `chunk_ids` from `question`
+    2. Summarization Agent: generates `draft_answer` from `question` + context
+    3. Verification Agent: produces final `answer` from `question` + context + `draft_answer`
+
+    Only chunk ids are stored (and checkpointed); the context text is
+    rendered from the chunk store by the nodes that read it.
     """
     question              : str
-    context               : str |None
     draft_answer          : str |None
     answer                : str|None
-    raw_docs              : Optional[List[Document]]  # NEW: Store original documents
-    raw_context_blocks    : Optional[List[str]]       # NEW: Individual chunk strings
+    namespace             : Optional[str]             # Collection/tenant namespace to search
+    filters               : Optional[Dict[str, Any]]  # Pinecone metadata filter
+    pipeline              : Optional[PipelineOptions] # Per-run configuration overrides
+    chunk_ids             : Optional[List[str]]       # Retrieved chunk ids (text lives in the chunk store)
+    kept_chunk_ids        : Optional[List[str]]       # Chunk ids kept by the critic
     context_rationale     : Optional[str]             # NEW: Critic's reasoning
-    chunk_relevance_scores: Optional[List[dict]]      # NEW: Per-chunk scores
\ No newline at end of file
+    chunk_relevance_scores: Optional[List[dict]]      # NEW: Per-chunk scores
+    history               : Optional[List[str]]       # Earlier questions of the session
+    session_chunk_ids     : Optional[List[str]]       # Chunks kept in earlier session turns
+    cached_assessments    : Optional[Dict[str, dict]] # Session critic verdicts for this question by chunk id
+    chunk_assessments     : Optional[Dict[str, dict]] # Critic verdicts for this turn by chunk id
+    route                 : Optional[Dict[str, Any]]  # Router's tier and per-node model/max_tokens
+    metrics               : Annotated[Dict[str, Dict[str, Any]], merge_metrics]  # Per-node tokens/latency
\ No newline at end of file
@@ -0,0 +1,235 @@
+"""Incremental verification of a streamed summarization answer.
+
+Instead of waiting for the full draft answer before verification starts,
+the summarizer's tokens are streamed, segmented into sentences, and each
+sentence is verified as soon as it is complete:
+
+1. A cheap local check measures how much of the sentence's content (words
+   and every number) appears in the context.
+2. Only sentences that fail the local check are sent to the Verification
+   Agent, which returns a corrected sentence or `UNSUPPORTED`. These calls
+   run on worker threads while the summarizer stream keeps being read.
+
+Sentence events are emitted in draft order as soon as each sentence and all
+earlier ones are verified. The final answer is assembled from the verified
+sentences, so verification overlaps with generation instead of running
+after it.
+"""
+
+import re
+import string
+import time
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Deque, Dict, Iterable, Iterator, List, Tuple
+
+from langchain_core.messages import AIMessageChunk
+
+from ..config import get_settings
+from .agents import (
+    _extract_last_ai_content,
+    _grounded_messages,
+    _usage_metrics,
+    summarization_agent,
+    verification_agent,
+)
+from .prompts import SENTENCE_VERIFICATION_INSTRUCTIONS, SUMMARIZATION_INSTRUCTIONS
+from .support import content_terms, support_score
+
+# A sentence ends at ., ! or ? followed by whitespace, or at a line break
+_SENTENCE_BOUNDARY = re.compile(r"(?<=[.!?])\s+|\n+")
+
+# Words ending in "." that rarely end a sentence
+_ABBREVIATIONS = frozenset(
+    "e.g i.e etc vs cf al mr mrs ms dr prof st inc ltd co corp no nos fig figs "
+    "eq sec ch vol approx p pp".split()
+)
+# Shorter fragments are joined with the next sentence instead of verified alone
+_MIN_SENTENCE_WORDS = 3
+
+# Flagged sentences verified concurrently with the draft stream
+_VERIFICATION_WORKERS = 4
+
+UNSUPPORTED_MARKER = "UNSUPPORTED"
+
+
+def is_unsupported_reply(reply: str) -> bool:
+    """Whether a verifier reply is the `UNSUPPORTED` marker.
+
+    Models sometimes quote, punctuate or re-case the marker ("UNSUPPORTED.",
+    `"Unsupported"`), so the reply is compared without them.
+    """
+    return reply.strip(string.whitespace + string.punctuation + "“”‘’").upper() == UNSUPPORTED_MARKER
+
+
+def _is_sentence_end(buffer: str, match: "re.Match[str]") -> bool:
+    """Whether a candidate boundary really ends a sentence.
+
+    Line breaks always do. After `.`, `!` or `?` the next sentence must not
+    start in lowercase, the last word must not be a known abbreviation or
+    an initial, and the sentence must have at least `_MIN_SENTENCE_WORDS`
+    words, so fragments like "e.g." or "Mr." are never verified alone.
+    """
+    if "\n" in match.group():
+        return True
+    if buffer[match.end()].islower():
+        return False
+
+    words = buffer[: match.start()].split()
+    last_word = words[-1] if words else ""
+    if last_word.endswith("."):
+        stem = last_word.rstrip(".").lower()
+        if stem in _ABBREVIATIONS or (len(stem) == 1 and stem.isalpha()):
+            return False
+    return len(words) >= _MIN_SENTENCE_WORDS
+
+def split_sentences(tokens: Iterable[str]) -> Iterator[Tuple[str, str]]:
+    """Segment a token stream into sentences as soon as each one completes.
+
+    Yields:
+        `(sentence, separator)` pairs, where `separator` is the whitespace
+        that followed the sentence, so the original layout can be rebuilt.
+    """
+    buffer = ""
+    scan_from = 0
+    for token in tokens:
+        buffer += token
+        while True:
+            match = _SENTENCE_BOUNDARY.search(buffer, scan_from)
+            # A boundary at the very end may still grow (e.g. "\n" -> "\n\n")
+            if not match or match.end() == len(buffer):
+                break
+            if not _is_sentence_end(buffer, match):
+                scan_from = match.end()
+                continue
+            sentence = buffer[: match.start()]
+            if sentence.strip():
+                yield sentence.strip(), match.group()
+            buffer = buffer[match.end():]
+            scan_from = 0
+
+    if buffer.strip():
+        yield buffer.strip(), ""
+
+
+def _stream_draft_tokens(question: str, context: str, usage: List[AIMessageChunk]) -> Iterator[str]:
+    """Stream summarization tokens using the same cache-friendly layout as the graph."""
+    task = f"{SUMMARIZATION_INSTRUCTIONS}\nQuestion: {question}"
+    stream = summarization_agent.stream(
+        {"messages": _grounded_messages(context, task)},
+        stream_mode="messages",
+    )
+    for chunk, _metadata in stream:
+        if not isinstance(chunk, AIMessageChunk):
+            continue
+        usage.append(chunk)
+        if isinstance(chunk.content, str) and chunk.content:
+            yield chunk.content
+
+
+def _verify_sentence(question: str, context: str, sentence: str, usage: List[object]) -> str:
+    """Ask the Verification Agent to correct a single flagged sentence."""
+    task = f"{SENTENCE_VERIFICATION_INSTRUCTIONS}\nQuestion: {question}\n\nSentence:\n{sentence}"
+    result = verification_agent.invoke({"messages": _grounded_messages(context, task)})
+    messages = result.get("messages", [])
+    usage.extend(messages)
+
+    verified = _extract_last_ai_content(messages).strip()
+    return "" if is_unsupported_reply(verified) else verified
+
+
+def stream_verified_answer(question: str, context: str) -> Iterator[Dict[str, Any]]:
+    """Stream the answer sentence by sentence, verifying each as it arrives.
+
+    Flagged sentences are verified on worker threads while later sentences
+    are still being drafted; events are emitted in draft order.
+
+    Yields:
+        `{"type": "sentence", ...}` events for every drafted sentence, with
+        `status` one of `kept`, `corrected` or `removed` and `verified_by`
+        either `overlap` (local check) or `llm`; then a final
+        `{"type": "answer", ...}` event with the assembled answer, the full
+        draft and streaming metrics.
+    """
+    settings = get_settings()
+    model_name = settings.openai_model_name
+    min_support = settings.stream_verification_min_support
+    context_terms = content_terms(context)
+
+    started = time.perf_counter()
+    first_sentence_ms = None
+    draft_usage: List[AIMessageChunk] = []
+    verification_usage: List[object] = []
+    draft_parts: List[str] = []
+    answer_parts: List[str] = []
+    llm_checked = removed = 0
+
+    # (index, sentence, separator, score, verified sentence or pending call)
+    pending: Deque[Tuple[int, str, str, float, Any]] = deque()
+
+    def finished(wait: bool) -> Iterator[Dict[str, Any]]:
+        nonlocal first_sentence_ms, removed
+        while pending:
+            index, sentence, separator, score, verified = pending[0]
+            if isinstance(verified, Future):
+                if not (wait or verified.done()):
+                    return
+                verified_by, verified = "llm", verified.result()
+            else:
+                verified_by = "overlap"
+            pending.popleft()
+
+            if not verified:
+                status = "removed"
+                removed += 1
+            else:
+                status = "kept" if verified == sentence else "corrected"
+                answer_parts.append(verified + (separator or " "))
+
+            if first_sentence_ms is None:
+                first_sentence_ms = round((time.perf_counter() - started) * 1000, 1)
+
+            yield {
+                "type"       : "sentence",
+                "index"      : index,
+                "text"       : verified,
+                "draft"      : sentence,
+                "status"     : status,
+                "verified_by": verified_by,
+                "support"    : round(score, 3),
+            }
+
+    with ThreadPoolExecutor(max_workers=_VERIFICATION_WORKERS) as pool:
+        for index, (sentence, separator) in enumerate(
+            split_sentences(_stream_draft_tokens(question, context, draft_usage))
+        ):
+            draft_parts.append(sentence + separator)
+            score = support_score(sentence, context_terms)
+
+            if score >= min_support:
+                verified: Any = sentence
+            else:
+                verified = pool.submit(_verify_sentence, question, context, sentence, verification_usage)
+                llm_checked += 1
+
+            pending.append((index, sentence, separator, score, verified))
+            yield from finished(wait=False)
+
+        yield from finished(wait=True)
+
+    draft_message = sum(draft_usage[1:], draft_usage[0]) if draft_usage else None
+    yield {
+        "type"        : "answer",
+        "answer"      : "".join(answer_parts).strip(),
+        "draft_answer": "".join(draft_parts).strip(),
+        "metrics"     : {
+            "summarization": _usage_metrics([draft_message] if draft_message else [], started, model_name),
+            "verification" : {
+                **_usage_metrics(verification_usage, started, model_name),
+                "sentences"        : len(draft_parts),
+                "llm_checked"      : llm_checked,
+                "removed"          : removed,
+                "first_sentence_ms": first_sentence_ms,
+            },
+        },
+    }
@@ -0,0 +1,42 @@
+"""Cheap lexical check of how well a text is covered by some context.
+
+Used where an LLM call can be skipped when the context already covers the
+text: streaming verification accepts draft sentences whose content terms
+all appear in the context, and follow-up questions in a session skip
+retrieval when the chunks carried over from earlier turns cover them.
+"""
+
+import re
+from typing import Set
+
+_WORD = re.compile(r"[a-z0-9]+(?:[.,][0-9]+)*")
+_NUMBER = re.compile(r"^[0-9]")
+
+_STOPWORDS = frozenset(
+    "the and for are but not you all any can had her was one our out has have "
+    "this that with from they will would there their what which when where who "
+    "how its also than then them these those into more most such only other "
+    "some very based context document answer question".split()
+)
+
+
+def content_terms(text: str) -> Set[str]:
+    """Lowercased words and numbers of `text`, without stopwords and short words."""
+    return {
+        term for term in _WORD.findall(text.lower())
+        if _NUMBER.match(term) or (len(term) > 2 and term not in _STOPWORDS)
+    }
+
+
+def support_score(text: str, context_terms: Set[str]) -> float:
+    """Share of a text's content terms found in the context.
+
+    Any number missing from the context scores 0.0: a wrong figure is never
+    a paraphrase, so it always needs a closer look.
+    """
+    terms = content_terms(text)
+    if not terms:
+        return 1.0
+    if any(_NUMBER.match(term) and term not in context_terms for term in terms):
+        return 0.0
+    return sum(term in context_terms for term in terms) / len(terms)
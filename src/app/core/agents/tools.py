@@ -1,13 +1,30 @@
 """Tools available to agents in the multi-agent RAG system."""
 
+from dataclasses import dataclass
+from typing import Any, Dict, Optional
+
+from langchain.tools import ToolRuntime
 from langchain_core.tools import tool
 
+from ..retrieval.chunk_store import get_chunk_store
 from ..retrieval.vector_store import retrieve
-from ..retrieval.serialization import serialize_chunks
+from ..retrieval.serialization import serialize_records
+
+
+@dataclass
+class RetrievalContext:
+    """Per-request retrieval scope injected into the Retrieval Agent at runtime.
+
+    The scope is supplied by the caller (never by the LLM), so a question can
+    only ever search the collection and metadata slice it was issued against.
+    """
+    namespace: Optional[str] = None
+    filters  : Optional[Dict[str, Any]] = None
+    k        : Optional[int] = None  # Chunks per search (defaults to 4)
 
 
 @tool(response_format="content_and_artifact")
-def retrieval_tool(query: str):
+def retrieval_tool(query: str, runtime: ToolRuntime):
     """Search the vector database for relevant document chunks.
 
     This tool retrieves the top 4 most relevant chunks from the Pinecone
@@ -21,14 +38,20 @@ def retrieval_tool(query: str):
         Tuple of (serialized_content, artifact) where:
         - serialized_content: A formatted string containing the retrieved chunks
           with metadata. Format: "Chunk 1 (page=X): ...\n\nChunk 2 (page=Y): ..."
-        - artifact: List of Document objects with full metadata for reference
+        - artifact: List of chunk ids; the chunks themselves live in the chunk store
     """
-    # Retrieve documents from vector store
-    docs = retrieve(query, k=4)
+    scope = runtime.context or RetrievalContext()
+
+    # Retrieve documents from vector store, scoped to the caller's namespace/filters
+    docs = retrieve(query, k=scope.k or 4, namespace=scope.namespace, filters=scope.filters)
+
+    # Store chunks once by id; downstream nodes render from the store
+    store = get_chunk_store()
+    chunk_ids = store.put_documents(docs)
 
     # Serialize chunks into formatted string (content)
-    context = serialize_chunks(docs)
+    context = serialize_records(store.get_many(chunk_ids))
 
-    # Return tuple: (serialized content, artifact documents)
+    # Return tuple: (serialized content, artifact chunk ids)
     # This follows LangChain's content_and_artifact response format
-    return context, docs
\ No newline at end of file
+    return context, chunk_ids
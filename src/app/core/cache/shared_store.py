@@ -0,0 +1,244 @@
+"""Cross-process key-value cache backed by a local SQLite file.
+
+In multi-worker serving (see `src/app/serve.py`) every uvicorn worker is a
+separate process, so `lru_cache`-style caches are duplicated per worker and
+each worker pays its own cold misses. Caches that are worth sharing (query
+embeddings, first-turn answers) are kept here instead: one SQLite database
+in WAL mode, which lets all workers read concurrently while writes are
+serialized by SQLite itself.
+
+Per-conversation and per-request state that any worker may need next
+(sessions, retrieved chunks, prefetched results) is kept here as well, so
+requests need no sticky routing.
+
+Entries live in named buckets (e.g. `embedding:<model>` or
+`answer:<namespace>`) so that a whole bucket can be dropped at once, for
+example when new documents are indexed into a namespace. Every few hundred
+writes, expired entries are deleted and, beyond `max_entries`, the oldest
+writes are evicted, so the file does not grow without bound.
+"""
+
+import fcntl
+import logging
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+from functools import lru_cache
+from pathlib import Path
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from ..config import get_settings
+
+logger = logging.getLogger(__name__)
+
+# Writes (per process) between two prune passes
+_PRUNE_EVERY_WRITES = 256
+
+
+class SharedStore:
+    """Process- and thread-safe `(bucket, key) -> bytes` store with optional TTL."""
+
+    def __init__(
+        self,
+        path                : Path,
+        max_entries         : Optional[int] = None,
+        busy_timeout_seconds: float = 5.0,
+    ):
+        self.path = path
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.max_entries = max_entries
+        self.busy_timeout_seconds = busy_timeout_seconds
+        self._local = threading.local()
+        self._writes = 0
+        self._writes_lock = threading.Lock()
+
+        conn = self._connection()
+        conn.execute("PRAGMA journal_mode=WAL")
+        with conn:
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS entries ("
+                " bucket     TEXT NOT NULL,"
+                " key        TEXT NOT NULL,"
+                " value      BLOB NOT NULL,"
+                " expires_at REAL,"
+                " PRIMARY KEY (bucket, key))"
+            )
+
+    def _connection(self) -> sqlite3.Connection:
+        # SQLite connections must not be shared between threads
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(str(self.path), timeout=self.busy_timeout_seconds)
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    def get(self, bucket: str, key: str) -> Optional[bytes]:
+        """Return a live value, or None if it is unknown or expired."""
+        try:
+            row = self._connection().execute(
+                "SELECT value, expires_at FROM entries WHERE bucket = ? AND key = ?",
+                (bucket, key),
+            ).fetchone()
+        except sqlite3.OperationalError as e:
+            # A busy cache is a miss, never a failed request
+            logger.warning(f"Shared cache read skipped: {e}")
+            return None
+        if row is None or (row[1] is not None and row[1] < time.time()):
+            return None
+        return row[0]
+
+    def get_many(self, bucket: str, keys: Iterable[str]) -> Dict[str, bytes]:
+        """Return the live values of the given keys; unknown keys are left out."""
+        keys = list(keys)
+        if not keys:
+            return {}
+        try:
+            rows = self._connection().execute(
+                f"SELECT key, value FROM entries WHERE bucket = ? AND key IN ({', '.join('?' * len(keys))})"
+                " AND (expires_at IS NULL OR expires_at >= ?)",
+                (bucket, *keys, time.time()),
+            ).fetchall()
+        except sqlite3.OperationalError as e:
+            logger.warning(f"Shared cache read skipped: {e}")
+            return {}
+        return dict(rows)
+
+    def values(self, bucket: str, limit: int) -> List[bytes]:
+        """Return up to `limit` live values of a bucket, most recently written first."""
+        try:
+            rows = self._connection().execute(
+                "SELECT value FROM entries WHERE bucket = ? AND (expires_at IS NULL OR expires_at >= ?)"
+                " ORDER BY rowid DESC LIMIT ?",
+                (bucket, time.time(), limit),
+            ).fetchall()
+        except sqlite3.OperationalError as e:
+            logger.warning(f"Shared cache read skipped: {e}")
+            return []
+        return [row[0] for row in rows]
+
+    def put(self, bucket: str, key: str, value: bytes, ttl_seconds: Optional[float] = None) -> None:
+        """Store a value, replacing any previous one."""
+        self.put_many(bucket, [(key, value)], ttl_seconds=ttl_seconds)
+
+    def put_many(
+        self,
+        bucket     : str,
+        items      : Iterable[Tuple[str, bytes]],
+        ttl_seconds: Optional[float] = None,
+    ) -> None:
+        """Store several values of a bucket in one transaction."""
+        expires_at = time.time() + ttl_seconds if ttl_seconds else None
+        rows = [(bucket, key, sqlite3.Binary(value), expires_at) for key, value in items]
+        if not rows:
+            return
+        try:
+            with self._connection() as conn:
+                conn.executemany(
+                    "INSERT OR REPLACE INTO entries (bucket, key, value, expires_at) VALUES (?, ?, ?, ?)",
+                    rows,
+                )
+        except sqlite3.OperationalError as e:
+            # A busy cache must never fail the request that tried to fill it
+            logger.warning(f"Shared cache write skipped: {e}")
+            return
+        self._count_writes(len(rows))
+
+    def update(
+        self,
+        bucket     : str,
+        key        : str,
+        apply      : Callable[[Optional[bytes]], bytes],
+        ttl_seconds: Optional[float] = None,
+    ) -> bool:
+        """Replace a value with `apply(current)` without losing concurrent updates.
+
+        `current` is None if the entry is unknown or expired. The read and
+        the write happen in one write transaction, so no other process can
+        update the entry in between. An exception raised by `apply` leaves
+        the entry unchanged and is propagated.
+
+        Returns:
+            Whether the value was written (False if the store was busy).
+        """
+        conn = self._connection()
+        try:
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                row = conn.execute(
+                    "SELECT value, expires_at FROM entries WHERE bucket = ? AND key = ?",
+                    (bucket, key),
+                ).fetchone()
+                current = row[0] if row is not None and (row[1] is None or row[1] >= time.time()) else None
+                value = apply(current)
+                conn.execute(
+                    "INSERT OR REPLACE INTO entries (bucket, key, value, expires_at) VALUES (?, ?, ?, ?)",
+                    (bucket, key, sqlite3.Binary(value), time.time() + ttl_seconds if ttl_seconds else None),
+                )
+                conn.commit()
+            except BaseException:
+                conn.rollback()
+                raise
+        except sqlite3.OperationalError as e:
+            logger.warning(f"Shared cache update skipped: {e}")
+            return False
+        self._count_writes(1)
+        return True
+
+    def _count_writes(self, count: int) -> None:
+        with self._writes_lock:
+            due = (self._writes % _PRUNE_EVERY_WRITES) + count >= _PRUNE_EVERY_WRITES
+            self._writes += count
+        if due:
+            self.prune()
+
+    def prune(self) -> None:
+        """Delete expired entries, then the oldest writes beyond `max_entries`."""
+        try:
+            with self._connection() as conn:
+                conn.execute("DELETE FROM entries WHERE expires_at < ?", (time.time(),))
+                if self.max_entries is not None:
+                    # INSERT OR REPLACE assigns a fresh rowid, so rowid order is write order
+                    conn.execute(
+                        "DELETE FROM entries WHERE rowid IN ("
+                        " SELECT rowid FROM entries ORDER BY rowid"
+                        " LIMIT max(0, (SELECT count(*) FROM entries) - ?))",
+                        (self.max_entries,),
+                    )
+        except sqlite3.OperationalError as e:
+            logger.warning(f"Shared cache prune skipped: {e}")
+
+    def clear(self, bucket: str) -> None:
+        """Drop every entry of a bucket, along with any expired entries."""
+        try:
+            with self._connection() as conn:
+                conn.execute(
+                    "DELETE FROM entries WHERE bucket = ? OR expires_at < ?",
+                    (bucket, time.time()),
+                )
+        except sqlite3.OperationalError as e:
+            logger.warning(f"Shared cache clear skipped: {e}")
+
+
+@lru_cache(maxsize=1)
+def get_shared_store() -> SharedStore:
+    """Get this process's handle on the shared cache (singleton via LRU cache)."""
+    settings = get_settings()
+    return SharedStore(Path(settings.shared_cache_path), max_entries=settings.shared_cache_max_entries)
+
+
+@contextmanager
+def single_writer_lock(path: Path) -> Iterator[None]:
+    """Hold an exclusive, cross-process file lock (blocks until acquired).
+
+    Used so that only one worker writes to the indexes at a time while the
+    others keep serving reads.
+    """
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path, "a") as lock_file:
+        fcntl.flock(lock_file, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(lock_file, fcntl.LOCK_UN)
@@ -19,14 +19,90 @@ class Settings(BaseSettings):
       # OpenAI Configuration
     openai_api_key             : str
     openai_model_name          : str = "gpt-4o-mini"
+    openai_critic_model_name   : str = "gpt-4o-mini"
     openai_embedding_model_name: str = "text-embedding-3-small"
+    openai_fast_model_name     : str = "gpt-4.1-nano"
+
+      # OpenAI rate limits (per model, as granted by the provider)
+    openai_rpm_limit       : int = 500
+    openai_tpm_limit       : int = 200_000
+    openai_critic_rpm_limit: int = 500
+    openai_critic_tpm_limit: int = 200_000
+    openai_fast_rpm_limit  : int = 500
+    openai_fast_tpm_limit  : int = 200_000
 
       # Pinecone Configuration
-    pinecone_api_key   : str
-    pinecone_index_name: str
+    pinecone_api_key          : str
+    pinecone_index_name       : str
+    pinecone_default_namespace: str = ""
 
       # Retrieval Configuration
-    retrieval_k: int = 4
+    retrieval_k           : int = 4
+    chunk_store_max_chunks: int = 50_000
+
+      # Hierarchical chunking: children are embedded, parents are stored locally
+      # and returned instead of their children once enough children hit
+    parent_chunk_size        : int = 2000
+    parent_chunk_overlap     : int = 200
+    child_chunk_size         : int = 500
+    child_chunk_overlap      : int = 50
+    parent_expansion_min_hits: int = 2
+    parent_store_path        : str = "data/parents.sqlite3"
+
+      # Model routing: easy questions get the fast model and tighter output budgets;
+      # the standard tier is uncapped unless its limits are set. Verification
+      # rewrites the whole draft, so it gets more headroom than summarization
+    model_routing_enabled            : bool       = True
+    routing_fast_max_context_chars   : int        = 3000
+    routing_fast_max_question_words  : int        = 20
+    fast_summarization_max_tokens    : int        = 300
+    fast_verification_max_tokens     : int        = 600
+    standard_summarization_max_tokens: int | None = None
+    standard_verification_max_tokens : int | None = None
+
+      # Streaming verification: minimum share of a sentence's content words
+      # that must appear in the context before it is accepted without an LLM check
+    stream_verification_min_support: float = 0.8
+
+      # Retrieval prefetch (warm-up while the user is typing)
+    prefetch_ttl_seconds   : float = 30.0
+    prefetch_max_entries   : int   = 256
+    prefetch_min_similarity: float = 0.92
+    prefetch_min_chars     : int   = 12
+    prefetch_rpm_limit     : int   = 300
+
+      # Conversation sessions: follow-ups fully covered by the carried-over chunks
+      # skip retrieval, other follow-ups retrieve fewer new chunks
+    session_ttl_seconds         : int   = 1800
+    session_history_turns       : int   = 5
+    session_max_chunks          : int   = 32
+    session_carryover_chunks    : int   = 8
+    session_reuse_min_support   : float = 1.0
+    session_followup_retrieval_k: int   = 2
+
+      # Request scheduling / admission control
+    qa_max_concurrency          : int   = 4
+    qa_max_queue_size           : int   = 32
+    qa_queue_timeout_seconds    : float = 30.0
+    qa_estimated_tokens_per_call: int   = 1500
+
+      # Checkpointing: failed runs kept for resumption by request id (in a SQLite
+      # file shared by all workers), and in-graph retries of transient OpenAI
+      # errors (exponential backoff). A run still marked as running after
+      # the lease is treated as abandoned by a crashed worker.
+    qa_checkpoint_path            : str   = "data/checkpoints.sqlite3"
+    qa_checkpoint_max_threads     : int   = 1000
+    qa_run_lease_seconds          : float = 900.0
+    qa_node_max_attempts          : int   = 3
+    qa_node_retry_initial_interval: float = 1.0
+
+      # Multi-process serving: caches shared by all workers, single-writer indexing
+    serve_workers              : int = 1
+    shared_cache_path          : str = "data/shared_cache.sqlite3"
+    shared_cache_max_entries   : int = 100_000
+    answer_cache_ttl_seconds   : int = 3600
+    embedding_cache_ttl_seconds: int = 7 * 24 * 3600
+    index_lock_path            : str = "data/index.lock"
 
     model_config = SettingsConfigDict(
         env_file          = str(BASE_DIR / ".env"),   # ← Changed this line!
@@ -1,22 +1,35 @@
 """Factory functions for creating LangChain v1 LLM instances."""
 
 from langchain_openai import ChatOpenAI
+from openai import APIConnectionError, InternalServerError, RateLimitError
 
 from ..config import get_settings
 
 
-def create_chat_model(temperature: float = 0.0) -> ChatOpenAI:
+def create_chat_model(
+    temperature: float = 0.0,
+    model_name : str | None = None,
+    max_tokens : int | None = None,
+) -> ChatOpenAI:
     """Create a LangChain v1 ChatOpenAI instance.
 
     Args:
         temperature: Model temperature (default: 0.0 for deterministic outputs).
+        model_name: Model to use (defaults to `openai_model_name` from settings).
+        max_tokens: Optional cap on output tokens per call.
 
     Returns:
         Configured ChatOpenAI instance.
     """
     settings = get_settings()
     return ChatOpenAI(
-        model=settings.openai_model_name,
+        model=model_name or settings.openai_model_name,
         api_key=settings.openai_api_key,
         temperature=temperature,
-    )
\ No newline at end of file
+        max_tokens=max_tokens,
+    )
+
+def is_transient_error(exc: Exception) -> bool:
+    """Whether an LLM call failed for a reason worth retrying (rate limit, timeout, 5xx)."""
+    # APITimeoutError is a subclass of APIConnectionError
+    return isinstance(exc, (RateLimitError, APIConnectionError, InternalServerError))
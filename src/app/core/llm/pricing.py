@@ -0,0 +1,38 @@
+"""Approximate OpenAI list prices used to estimate per-node LLM cost."""
+
+from typing import Dict, NamedTuple, Optional
+
+
+class ModelPrice(NamedTuple):
+    """USD per 1M tokens."""
+    input       : float
+    cached_input: float
+    output      : float
+
+
+MODEL_PRICES: Dict[str, ModelPrice] = {
+    "gpt-4o"      : ModelPrice(input=2.50, cached_input=1.25,  output=10.00),
+    "gpt-4o-mini" : ModelPrice(input=0.15, cached_input=0.075, output=0.60),
+    "gpt-4.1"     : ModelPrice(input=2.00, cached_input=0.50,  output=8.00),
+    "gpt-4.1-mini": ModelPrice(input=0.40, cached_input=0.10,  output=1.60),
+    "gpt-4.1-nano": ModelPrice(input=0.10, cached_input=0.025, output=0.40),
+}
+
+
+def estimate_cost_usd(
+    model_name         : str,
+    input_tokens       : int,
+    cached_input_tokens: int,
+    output_tokens      : int,
+) -> Optional[float]:
+    """Estimate the cost of LLM calls, or None for a model without a known price."""
+    price = MODEL_PRICES.get(model_name)
+    if price is None:
+        return None
+    uncached = max(0, input_tokens - cached_input_tokens)
+    cost = (
+        uncached * price.input
+        + cached_input_tokens * price.cached_input
+        + output_tokens * price.output
+    ) / 1_000_000
+    return round(cost, 6)
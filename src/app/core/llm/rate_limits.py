@@ -0,0 +1,74 @@
+"""Provider rate-limit signals from LLM call sites to admission control.
+
+Graph nodes run on worker threads and retry OpenAI 429s in place (see
+`core/agents/graph.py`), and the streaming endpoint handles its errors
+inside the response body, so most 429s never reach the HTTP layer. Call
+sites report them here instead; the QA scheduler registers a listener that
+backs off its budgets. Listeners are called on the reporting thread and
+must be thread-safe. Without listeners (e.g. in the evaluation runner)
+reporting is a no-op.
+
+Nodes that only learn mid-run which model they will call (the router) add
+those calls to the run's budget reservation with `reserve_calls`. The QA
+scheduler installs a reserver for each run it admits (`reserving_calls`);
+it is a context variable, so it reaches the graph's worker threads. Outside
+an admitted run reserving is a no-op.
+"""
+
+import threading
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Callable, Iterator, List, Optional
+
+RateLimitListener = Callable[[float], None]
+
+# Called with (model name, number of calls)
+CallReserver = Callable[[str, int], None]
+
+DEFAULT_RETRY_AFTER_SECONDS = 5.0
+
+_listeners: List[RateLimitListener] = []
+_listeners_lock = threading.Lock()
+
+_call_reserver: ContextVar[Optional[CallReserver]] = ContextVar("call_reserver", default=None)
+
+
+def add_rate_limit_listener(listener: RateLimitListener) -> None:
+    """Call `listener(retry_after_seconds)` whenever a 429 is reported."""
+    with _listeners_lock:
+        _listeners.append(listener)
+
+
+def retry_after_seconds(exc: Exception) -> float:
+    """The provider's `Retry-After` hint for a rate-limit error, if it sent one."""
+    response = getattr(exc, "response", None)
+    try:
+        return max(1.0, float(response.headers.get("retry-after", DEFAULT_RETRY_AFTER_SECONDS)))
+    except (AttributeError, ValueError):
+        return DEFAULT_RETRY_AFTER_SECONDS
+
+
+def report_rate_limited(exc: Exception) -> None:
+    """Tell every listener that the provider rate limited a call."""
+    seconds = retry_after_seconds(exc)
+    with _listeners_lock:
+        listeners = list(_listeners)
+    for listener in listeners:
+        listener(seconds)
+
+
+@contextmanager
+def reserving_calls(reserver: CallReserver) -> Iterator[None]:
+    """Route `reserve_calls` made in the enclosed block (and threads it starts) to `reserver`."""
+    token = _call_reserver.set(reserver)
+    try:
+        yield
+    finally:
+        _call_reserver.reset(token)
+
+
+def reserve_calls(model_name: str, calls: int) -> None:
+    """Add `calls` on `model_name` to the current run's budget reservation."""
+    reserver = _call_reserver.get()
+    if reserver is not None:
+        reserver(model_name, calls)
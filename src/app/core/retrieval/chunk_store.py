@@ -0,0 +1,128 @@
+"""Compact in-process store for retrieved document chunks.
+
+Retrieved chunks are stored once, by id, so that the graph state only has
+to carry chunk ids and each stage renders its prompt text directly from the
+store instead of re-serializing `Document` objects. Records use `__slots__`
+and interned source strings to keep per-chunk overhead small.
+
+Records are also written through to the shared store (see
+`core/cache/shared_store.py`): a follow-up question or a resumed run may be
+served by another worker than the one that retrieved its chunks, and falls
+back to the shared copy. Records never change for a given id, so shared
+copies need no expiry beyond the shared store's size bound.
+"""
+
+import hashlib
+import json
+import sys
+import threading
+from collections import OrderedDict
+from functools import lru_cache
+from typing import Iterable, List, Optional
+
+from langchain_core.documents import Document
+
+from ..cache.shared_store import SharedStore, get_shared_store
+from ..config import get_settings
+
+_SHARED_BUCKET = "chunk"
+
+
+class ChunkRecord:
+    """Text and display metadata of a single retrieved chunk."""
+
+    __slots__ = ("chunk_id", "text", "source", "page")
+
+    def __init__(self, chunk_id: str, text: str, source: Optional[str], page: Optional[int]):
+        self.chunk_id = chunk_id
+        self.text = text
+        self.source = source
+        self.page = page
+
+    @classmethod
+    def from_document(cls, doc: Document) -> "ChunkRecord":
+        """Build a record from a retrieved `Document`, deriving a stable id."""
+        metadata = doc.metadata or {}
+        source = metadata.get("source")
+        page = metadata.get("page", metadata.get("page_number"))
+        text = doc.page_content.strip()
+
+        chunk_id = doc.id or hashlib.sha1(f"{source}|{page}|{text}".encode("utf-8")).hexdigest()[:16]
+
+        return cls(
+            chunk_id = sys.intern(str(chunk_id)),
+            text     = text,
+            source   = sys.intern(str(source)) if source is not None else None,
+            page     = int(page) if isinstance(page, (int, float)) else None,
+        )
+
+    def to_json(self) -> bytes:
+        return json.dumps([self.chunk_id, self.text, self.source, self.page]).encode("utf-8")
+
+    @classmethod
+    def from_json(cls, value: bytes) -> "ChunkRecord":
+        chunk_id, text, source, page = json.loads(value)
+        return cls(
+            chunk_id = sys.intern(chunk_id),
+            text     = text,
+            source   = sys.intern(source) if source is not None else None,
+            page     = page,
+        )
+
+
+class ChunkStore:
+    """Thread-safe, size-bounded (LRU) mapping of chunk id to `ChunkRecord`.
+
+    With a `shared` store, records are written through to it and records
+    missing locally are looked up there.
+    """
+
+    def __init__(self, max_chunks: int, shared: Optional[SharedStore] = None):
+        self.max_chunks = max_chunks
+        self.shared = shared
+        self._records: "OrderedDict[str, ChunkRecord]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._records)
+
+    def put_documents(self, docs: Iterable[Document]) -> List[str]:
+        """Store retrieved documents and return their chunk ids in order."""
+        records = [ChunkRecord.from_document(doc) for doc in docs]
+        self._put_local(records)
+        if self.shared is not None:
+            self.shared.put_many(_SHARED_BUCKET, [(record.chunk_id, record.to_json()) for record in records])
+        return [record.chunk_id for record in records]
+
+    def _put_local(self, records: Iterable[ChunkRecord]) -> None:
+        with self._lock:
+            for record in records:
+                self._records[record.chunk_id] = record
+                self._records.move_to_end(record.chunk_id)
+            while len(self._records) > self.max_chunks:
+                self._records.popitem(last=False)
+
+    def get(self, chunk_id: str) -> Optional[ChunkRecord]:
+        """Return a record by id, or None if it is unknown or was evicted."""
+        records = self.get_many([chunk_id])
+        return records[0] if records else None
+
+    def get_many(self, chunk_ids: Iterable[str]) -> List[ChunkRecord]:
+        """Return records for the given ids in order, skipping unknown ids."""
+        chunk_ids = list(chunk_ids)
+        with self._lock:
+            found = {cid: self._records[cid] for cid in chunk_ids if cid in self._records}
+
+        missing = [cid for cid in chunk_ids if cid not in found]
+        if missing and self.shared is not None:
+            fetched = [ChunkRecord.from_json(value) for value in self.shared.get_many(_SHARED_BUCKET, missing).values()]
+            self._put_local(fetched)
+            found.update((record.chunk_id, record) for record in fetched)
+
+        return [found[cid] for cid in chunk_ids if cid in found]
+
+
+@lru_cache(maxsize=1)
+def get_chunk_store() -> ChunkStore:
+    """Get the process-wide chunk store (singleton via LRU cache)."""
+    return ChunkStore(max_chunks=get_settings().chunk_store_max_chunks, shared=get_shared_store())
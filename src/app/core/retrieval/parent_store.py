@@ -0,0 +1,76 @@
+"""Local store for the parent sections of hierarchically chunked documents.
+
+Documents are indexed at two granularities: small child chunks are embedded
+and searched in Pinecone, while the larger parent sections they were cut
+from are kept here, in a local SQLite file, keyed by `parent_id`. When
+several retrieved children share a parent, `retrieve` swaps them for the
+single parent section so the agents see one richer chunk instead of several
+overlapping fragments.
+"""
+
+import json
+import sqlite3
+import threading
+from functools import lru_cache
+from pathlib import Path
+from typing import Dict, Iterable, List
+
+from langchain_core.documents import Document
+
+from ..config import get_settings
+
+
+class ParentStore:
+    """Thread-safe SQLite mapping of `(namespace, parent_id)` to a parent section."""
+
+    def __init__(self, path: Path):
+        self.path = path
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(str(path), check_same_thread=False)
+        self._lock = threading.Lock()
+        # WAL lets other serving workers read while the indexing worker writes
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        with self._lock, self._conn:
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS parents ("
+                " namespace TEXT NOT NULL,"
+                " parent_id TEXT NOT NULL,"
+                " text      TEXT NOT NULL,"
+                " metadata  TEXT NOT NULL,"
+                " PRIMARY KEY (namespace, parent_id))"
+            )
+
+    def put_documents(self, namespace: str, parents: Iterable[Document]) -> int:
+        """Store parent sections; each document's `id` is its parent id."""
+        rows = [
+            (namespace, doc.id, doc.page_content, json.dumps(doc.metadata, default=str))
+            for doc in parents
+        ]
+        with self._lock, self._conn:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO parents (namespace, parent_id, text, metadata) VALUES (?, ?, ?, ?)",
+                rows,
+            )
+        return len(rows)
+
+    def get_many(self, namespace: str, parent_ids: List[str]) -> Dict[str, Document]:
+        """Return the known parent sections for the given ids, keyed by id."""
+        if not parent_ids:
+            return {}
+        placeholders = ",".join("?" * len(parent_ids))
+        with self._lock:
+            rows = self._conn.execute(
+                f"SELECT parent_id, text, metadata FROM parents"
+                f" WHERE namespace = ? AND parent_id IN ({placeholders})",
+                [namespace, *parent_ids],
+            ).fetchall()
+        return {
+            parent_id: Document(id=parent_id, page_content=text, metadata=json.loads(metadata))
+            for parent_id, text, metadata in rows
+        }
+
+
+@lru_cache(maxsize=1)
+def get_parent_store() -> ParentStore:
+    """Get the process-wide parent store (singleton via LRU cache)."""
+    return ParentStore(Path(get_settings().parent_store_path))
@@ -0,0 +1,115 @@
+"""Short-lived retrieval warm-up cache fed by the frontend's typing path.
+
+While the user is still typing, the frontend calls `/qa/prefetch` with the
+partial question. The partial question is embedded and its Pinecone results
+are cached for a few seconds. When the real question (or the retrieval
+agent's reformulation of it) arrives, `retrieve` embeds it and reuses the
+prefetched results if the two embeddings are close enough, skipping the
+Pinecone round trip. Query embeddings are cached by exact text as well, so
+a question that matches the last prefetched text skips embedding too.
+"""
+
+import base64
+import hashlib
+import json
+from functools import lru_cache
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+from langchain_core.documents import Document
+
+from ..cache.shared_store import SharedStore, get_shared_store
+from ..config import get_settings
+
+
+def _normalize(embedding: Any) -> np.ndarray:
+    vector = np.asarray(embedding, dtype=np.float32)
+    norm = float(np.linalg.norm(vector))
+    return vector / norm if norm else vector
+
+
+def _filters_key(filters: Optional[Dict[str, Any]]) -> str:
+    return json.dumps(filters, sort_keys=True, default=str) if filters else ""
+
+
+def _bucket(namespace: str) -> str:
+    return f"prefetch:{namespace}"
+
+
+class PrefetchCache:
+    """TTL-bounded cache of retrieval results keyed by query embedding.
+
+    Entries live in the shared store, one bucket per namespace, so a
+    question can reuse results prefetched by any serving worker.
+    """
+
+    def __init__(self, store: SharedStore, ttl_seconds: float, max_entries: int, min_similarity: float):
+        self.store = store
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self.min_similarity = min_similarity
+
+    def put(
+        self,
+        namespace: str,
+        filters  : Optional[Dict[str, Any]],
+        k        : int,
+        embedding: Any,
+        docs     : List[Document],
+    ) -> None:
+        """Cache the results of a prefetch query."""
+        vector = _normalize(embedding)
+        scope = _filters_key(filters)
+        key = hashlib.sha1(f"{scope}|{k}|".encode("utf-8") + vector.tobytes()).hexdigest()
+        value = json.dumps({
+            "filters"  : scope,
+            "k"        : k,
+            "embedding": base64.b64encode(vector.tobytes()).decode("ascii"),
+            "docs"     : [
+                {"id": doc.id, "page_content": doc.page_content, "metadata": doc.metadata}
+                for doc in docs
+            ],
+        }, default=str)
+        self.store.put(_bucket(namespace), key, value.encode("utf-8"), ttl_seconds=self.ttl_seconds)
+
+    def lookup(
+        self,
+        namespace: str,
+        filters  : Optional[Dict[str, Any]],
+        k        : int,
+        embedding: Any,
+    ) -> Optional[List[Document]]:
+        """Return prefetched results for a close-enough query, or None."""
+        vector = _normalize(embedding)
+        scope = _filters_key(filters)
+        candidates = [
+            entry for entry in map(json.loads, self.store.values(_bucket(namespace), self.max_entries))
+            if entry["filters"] == scope and entry["k"] >= k
+        ]
+        if not candidates:
+            return None
+
+        embeddings = np.stack([
+            np.frombuffer(base64.b64decode(entry["embedding"]), dtype=np.float32) for entry in candidates
+        ])
+        similarities = embeddings @ vector
+        best = int(np.argmax(similarities))
+        if similarities[best] < self.min_similarity:
+            return None
+        return [Document(**doc) for doc in candidates[best]["docs"][:k]]
+
+    def clear(self, namespace: str) -> None:
+        """Drop a namespace's cached results, e.g. after new documents were indexed."""
+        self.store.clear(_bucket(namespace))
+
+
+@lru_cache(maxsize=1)
+def get_prefetch_cache() -> PrefetchCache:
+    """Get the process-wide prefetch cache (singleton via LRU cache)."""
+    settings = get_settings()
+    return PrefetchCache(
+        store          = get_shared_store(),
+        ttl_seconds    = settings.prefetch_ttl_seconds,
+        max_entries    = settings.prefetch_max_entries,
+        min_similarity = settings.prefetch_min_similarity,
+    )
@@ -0,0 +1,178 @@
+"""Compact, memory-mapped local vector index with int8 quantization.
+
+For large corpora, holding every float32 embedding in memory is expensive
+(6 KiB per chunk for 1536-dim embeddings). This index stores embeddings in a
+directory of memory-mapped files:
+
+- `codes.i8`  : int8 codes, one row per vector (symmetric per-vector scale)
+- `scales.f32`: the per-vector dequantization scale
+- `vectors.f32`: full-precision vectors, only touched to re-score a shortlist
+- `ids.json`  : chunk ids, in row order, plus the vector dimension
+
+A query is answered in two passes: approximate cosine scores over the int8
+codes (scanned in blocks, so memory stays bounded), then exact re-scoring of
+the best `shortlist` candidates against the float32 vectors. Only the int8
+codes and scales need to stay resident (`dim + 4` bytes per chunk); the
+float32 file is paged in for a few rows per query.
+
+The index saves memory, not time: each int8 block is widened to float32
+before the product, so a scan is somewhat slower than a float32 scan over
+vectors that already fit in memory.
+"""
+
+import json
+from pathlib import Path
+from typing import Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+CODES_FILE = "codes.i8"
+SCALES_FILE = "scales.f32"
+VECTORS_FILE = "vectors.f32"
+IDS_FILE = "ids.json"
+
+_BLOCK_ROWS = 4096
+
+
+def _normalize_rows(vectors: np.ndarray) -> np.ndarray:
+    norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return vectors / norms
+
+
+def quantize(vectors: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """Quantize float vectors to int8 with a symmetric per-vector scale.
+
+    Returns:
+        `(codes, scales)` such that `codes * scales[:, None]` approximates
+        the input.
+    """
+    scales = np.abs(vectors).max(axis=1) / 127.0
+    scales[scales == 0] = 1.0
+    codes = np.clip(np.rint(vectors / scales[:, None]), -127, 127).astype(np.int8)
+    return codes, scales.astype(np.float32)
+
+
+class QuantizedIndex:
+    """Read-only, memory-mapped int8 index with full-precision re-scoring."""
+
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        meta = json.loads((self.path / IDS_FILE).read_text(encoding="utf-8"))
+        self.dim: int = meta["dim"]
+        self.ids: List[str] = meta["ids"]
+
+        count = len(self.ids)
+        if not count:
+            # Empty files cannot be memory-mapped
+            self.codes = np.empty((0, self.dim), dtype=np.int8)
+            self.scales = np.empty((0,), dtype=np.float32)
+            self.vectors = np.empty((0, self.dim), dtype=np.float32)
+            return
+        self.codes = np.memmap(self.path / CODES_FILE, dtype=np.int8, mode="r", shape=(count, self.dim))
+        self.scales = np.memmap(self.path / SCALES_FILE, dtype=np.float32, mode="r", shape=(count,))
+        self.vectors = np.memmap(self.path / VECTORS_FILE, dtype=np.float32, mode="r", shape=(count, self.dim))
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    @classmethod
+    def build(
+        cls,
+        path   : Path,
+        ids    : Sequence[str],
+        batches: Iterable[np.ndarray],
+        dim    : int = 0,
+    ) -> "QuantizedIndex":
+        """Write an index from embeddings supplied in row batches.
+
+        Args:
+            path: Directory to write the index files into.
+            ids: Chunk ids, one per embedding row.
+            batches: Float embedding batches of shape `(rows, dim)`, in id order;
+                batching keeps memory bounded for very large corpora.
+            dim: Vector dimension recorded for an empty index; otherwise it
+                is taken from the batches.
+
+        Returns:
+            The opened index.
+        """
+        path = Path(path)
+        path.mkdir(parents=True, exist_ok=True)
+
+        count = len(ids)
+        codes = scales = vectors = None
+        offset = 0
+        for batch in batches:
+            batch = _normalize_rows(np.asarray(batch, dtype=np.float32))
+            if not len(batch):
+                continue
+            if codes is None:
+                dim = batch.shape[1]
+                codes = np.memmap(path / CODES_FILE, dtype=np.int8, mode="w+", shape=(count, dim))
+                scales = np.memmap(path / SCALES_FILE, dtype=np.float32, mode="w+", shape=(count,))
+                vectors = np.memmap(path / VECTORS_FILE, dtype=np.float32, mode="w+", shape=(count, dim))
+
+            rows = slice(offset, offset + len(batch))
+            codes[rows], scales[rows] = quantize(batch)
+            vectors[rows] = batch
+            offset += len(batch)
+
+        if offset != count:
+            raise ValueError(f"Expected {count} embeddings, got {offset}")
+
+        if codes is None:
+            for name in (CODES_FILE, SCALES_FILE, VECTORS_FILE):
+                (path / name).write_bytes(b"")
+        else:
+            for mapped in (codes, scales, vectors):
+                mapped.flush()
+        (path / IDS_FILE).write_text(json.dumps({"dim": dim, "ids": list(ids)}), encoding="utf-8")
+        return cls(path)
+
+    def _approximate_top(self, query: np.ndarray, n: int) -> np.ndarray:
+        """Row indices of the `n` best approximate scores over the int8 codes."""
+        scores = np.empty(len(self), dtype=np.float32)
+        # Widen one cache-sized block at a time so the product runs through BLAS
+        block = np.empty((_BLOCK_ROWS, self.dim), dtype=np.float32)
+
+        for start in range(0, len(self), _BLOCK_ROWS):
+            stop = min(start + _BLOCK_ROWS, len(self))
+            widened = block[: stop - start]
+            np.copyto(widened, self.codes[start:stop], casting="unsafe")
+            np.matmul(widened, query, out=scores[start:stop])
+        scores *= self.scales
+
+        if n >= len(scores):
+            return np.arange(len(scores))
+        return np.argpartition(scores, -n)[-n:]
+
+    def search(
+        self,
+        embedding: Sequence[float],
+        k        : int,
+        shortlist: Optional[int] = None,
+    ) -> List[Tuple[str, float]]:
+        """Top-k by cosine similarity: an int8 shortlist re-scored at full precision.
+
+        Args:
+            embedding: Query embedding.
+            k: Number of results to return.
+            shortlist: Candidates re-scored with float32 vectors (default `10 * k`).
+
+        Returns:
+            `(chunk_id, cosine_similarity)` pairs, best first.
+        """
+        if not len(self) or k <= 0:
+            return []
+        query = _normalize_rows(np.asarray(embedding, dtype=np.float32)[None, :])[0]
+        shortlist = min(len(self), max(k, shortlist or 10 * k))
+
+        candidates = np.sort(self._approximate_top(query, shortlist))
+        exact = self.vectors[candidates] @ query
+        order = np.argsort(-exact)[:k]
+        return [(self.ids[candidates[i]], float(exact[i])) for i in order]
+
+    def resident_bytes_per_vector(self) -> int:
+        """Bytes per vector that must stay in memory for the approximate pass."""
+        return self.dim * self.codes.itemsize + self.scales.itemsize
@@ -1,36 +1,61 @@
 """Utilities for serializing retrieved document chunks."""
 
-from typing import List
+from typing import Iterable, List
 
-from langchain_core.documents import Document
+from .chunk_store import ChunkRecord
 
+# Block layout used for the critic's input and the downstream CONTEXT
+CHUNK_BLOCK_TEMPLATE = "[Chunk {index}]\n{metadata}Content: {text}\n"
 
-def serialize_chunks(docs: List[Document]) -> str:
-    """Serialize a list of Document objects into a formatted CONTEXT string.
 
-    Formats chunks with indices and page numbers as specified in the PRD:
-    - Chunks are numbered (Chunk 1, Chunk 2, etc.)
-    - Page numbers are included in the format "page=X"
-    - Produces a clean CONTEXT section for agent consumption
+def serialize_records(records: Iterable[ChunkRecord]) -> str:
+    """Serialize stored chunk records into a formatted CONTEXT string.
+
+    Chunks are numbered (Chunk 1, Chunk 2, etc.) and carry their page number
+    as "page=X", as specified in the PRD.
 
     Args:
-        docs: List of Document objects with metadata.
+        records: Chunk records from the chunk store.
 
     Returns:
         Formatted string with all chunks serialized.
     """
-    context_parts = []
+    return "\n\n".join(
+        f"Chunk {idx} (page={record.page if record.page is not None else 'unknown'}):\n{record.text}"
+        for idx, record in enumerate(records, start=1)
+    )
+
+
+def format_chunk_block(index: int, record: ChunkRecord) -> str:
+    """Render one chunk record as a `[Chunk i]` block using `CHUNK_BLOCK_TEMPLATE`."""
+    metadata = ""
+    if record.source is not None:
+        metadata += f"Source: {record.source}\n"
+    if record.page is not None:
+        metadata += f"Page: {record.page}\n"
+    return CHUNK_BLOCK_TEMPLATE.format(index=index, metadata=metadata, text=record.text)
 
-    for idx, doc in enumerate(docs, start=1):
-        # Extract page number from metadata
-        page_num = doc.metadata.get("page") or doc.metadata.get(
-            "page_number", "unknown"
-        )
 
-        # Format chunk with index and page number
-        chunk_header = f"Chunk {idx} (page={page_num}):"
-        chunk_content = doc.page_content.strip()
+def format_chunk_blocks(
+    records: List[ChunkRecord],
+    header : str = "",
+    indices: List[int] | None = None,
+) -> str:
+    """Render chunk records as numbered blocks, optionally preceded by a header.
 
-        context_parts.append(f"{chunk_header}\n{chunk_content}")
+    Args:
+        records: Chunk records to render.
+        header: Optional per-chunk header template taking `{index}`,
+            e.g. `"=== CHUNK {index} ===\n"`.
+        indices: Chunk numbers to display (defaults to 0..n-1), so a filtered
+            subset can keep the numbering it was retrieved with.
 
-    return "\n\n".join(context_parts)
\ No newline at end of file
+    Returns:
+        Blocks joined by blank lines.
+    """
+    if indices is None:
+        indices = list(range(len(records)))
+    return "\n\n".join(
+        header.format(index=i) + format_chunk_block(i, record)
+        for i, record in zip(indices, records)
+    )
@@ -1,9 +1,14 @@
 """Vector store wrapper for Pinecone integration with LangChain."""
 
+import hashlib
+import time
+import uuid
+from collections import Counter
 from pathlib import Path
 from functools import lru_cache
-from typing import List
+from typing import Any, Dict, List, Optional, Tuple
 
+import numpy as np
 from pinecone import Pinecone
 from langchain_core.documents import Document
 from langchain_pinecone import PineconeVectorStore
@@ -12,7 +17,10 @@ from langchain_community.document_loaders import PyPDFLoader
 from langchain_text_splitters import RecursiveCharacterTextSplitter
 
 
+from ..cache.shared_store import get_shared_store
 from ..config import get_settings
+from .parent_store import get_parent_store
+from .prefetch import get_prefetch_cache
 
 
 @lru_cache(maxsize=1)
@@ -33,51 +41,221 @@ def _get_vector_store() -> PineconeVectorStore:
         embedding = embeddings,
     )
 
-def get_retriever(k: int | None = None): 
-    """Get a Pinecone retriever instance.
+@lru_cache(maxsize=1024)
+def embed_query(query: str) -> Tuple[float, ...]:
+    """Embed a query string, caching embeddings by exact text.
 
-    Args: 
-    k   : Number of documents to retrieve (defaults to config value).
+    Embeddings are cached in-process and in the shared store, so a query
+    embedded by one serving worker is reused by the others.
+    """
+    bucket = f"embedding:{get_settings().openai_embedding_model_name}"
+    key = hashlib.sha1(query.encode("utf-8")).hexdigest()
+    store = get_shared_store()
+
+    cached = store.get(bucket, key)
+    if cached is not None:
+        return tuple(np.frombuffer(cached, dtype=np.float32).tolist())
+
+    vector = np.asarray(_get_vector_store().embeddings.embed_query(query), dtype=np.float32)
+    store.put(bucket, key, vector.tobytes(), ttl_seconds=get_settings().embedding_cache_ttl_seconds)
+    return tuple(vector.tolist())
+
+def _resolve_namespace(namespace: str | None) -> str:
+    """Map an optional collection identifier onto a Pinecone namespace."""
+    if namespace:
+        return namespace
+    return get_settings().pinecone_default_namespace
+
+def build_metadata_filter(
+    source        : str | None = None,
+    tags          : List[str] | None = None,
+    indexed_after : float | None = None,
+    indexed_before: float | None = None,
+) -> Dict[str, Any] | None:
+    """Translate user-facing retrieval filters into a Pinecone metadata filter.
 
-    Returns: 
-        PineconeVectorStore instance configured as a retriever.
+    Args:
+        source: Only match chunks indexed from this file name.
+        tags: Only match chunks carrying at least one of these tags.
+        indexed_after: Only match chunks indexed at or after this UNIX timestamp.
+        indexed_before: Only match chunks indexed at or before this UNIX timestamp.
+
+    Returns:
+        Pinecone filter dictionary, or None when no filter was requested.
     """
-    settings = get_settings()
-    if k is None: 
-        k = settings.retrieval_k
+    clauses: List[Dict[str, Any]] = []
 
-    vector_store = _get_vector_store()
-    return vector_store.as_retriever(search_kwargs={"k": k})
+    if source:
+        clauses.append({"filename": {"$eq": source}})
+    if tags:
+        clauses.append({"tags": {"$in": list(tags)}})
+
+    indexed_at: Dict[str, float] = {}
+    if indexed_after is not None:
+        indexed_at["$gte"] = indexed_after
+    if indexed_before is not None:
+        indexed_at["$lte"] = indexed_before
+    if indexed_at:
+        clauses.append({"indexed_at": indexed_at})
+
+    if not clauses:
+        return None
+    if len(clauses) == 1:
+        return clauses[0]
+    return {"$and": clauses}
+
+def _search(
+    embedding: Tuple[float, ...],
+    k        : int,
+    namespace: str,
+    filters  : Dict[str, Any] | None,
+) -> List[Document]:
+    results = _get_vector_store().similarity_search_by_vector_with_score(
+        list(embedding), k=k, filter=filters, namespace=namespace,
+    )
+    return [doc for doc, _score in results]
 
+def expand_to_parents(docs: List[Document], namespace: str) -> List[Document]:
+    """Replace child chunks with their parent section where enough children hit.
 
-def retrieve(query: str, k: int | None = None) -> List[Document]: 
+    Children whose parent received at least `parent_expansion_min_hits` hits
+    are collapsed into a single parent document, placed at the rank of the
+    best-scoring child. Other children (and chunks indexed without a
+    `parent_id`) are returned unchanged.
+    """
+    hits = Counter(doc.metadata.get("parent_id") for doc in docs)
+    hits.pop(None, None)
+    min_hits = get_settings().parent_expansion_min_hits
+    expand_ids = [parent_id for parent_id, count in hits.items() if count >= min_hits]
+    if not expand_ids:
+        return docs
+
+    parents = get_parent_store().get_many(namespace, expand_ids)
+    expanded: List[Document] = []
+    seen: set[str] = set()
+    for doc in docs:
+        parent_id = doc.metadata.get("parent_id")
+        parent = parents.get(parent_id)
+        if parent is None:
+            expanded.append(doc)
+        elif parent_id not in seen:
+            seen.add(parent_id)
+            expanded.append(parent)
+    return expanded
+
+def retrieve(
+    query    : str,
+    k        : int | None = None,
+    namespace: str | None = None,
+    filters  : Dict[str, Any] | None = None,
+) -> List[Document]: 
     """Retrieve documents from Pinecone for a given query.
 
+    Results warmed up by `prefetch` for a close-enough query embedding are
+    served from the prefetch cache without querying Pinecone. Child chunks
+    that share a parent section are returned as that parent (see
+    `expand_to_parents`), so fewer than `k` documents may come back.
+
     Args:
         query: Search query string.
         k: Number of documents to retrieve (defaults to config value).
+        namespace: Collection/tenant namespace to search.
+        filters: Optional Pinecone metadata filter (see `build_metadata_filter`).
 
     Returns:
         List of Document objects with metadata (including page numbers).
     """
-    retriever = get_retriever(k=k)
-    return retriever.invoke(query)
+    if k is None:
+        k = get_settings().retrieval_k
+    namespace = _resolve_namespace(namespace)
+    embedding = embed_query(query)
 
-def index_documents(file_path: Path) -> int:
-    """Index a list of Document objects into the Pinecone vector store.
+    docs = get_prefetch_cache().lookup(namespace, filters, k, embedding)
+    if docs is None:
+        docs = _search(embedding, k, namespace, filters)
+
+    return expand_to_parents(docs, namespace)
+
+def prefetch(
+    query    : str,
+    k        : int | None = None,
+    namespace: str | None = None,
+    filters  : Dict[str, Any] | None = None,
+) -> int:
+    """Embed a (partial) question and warm its results into the prefetch cache.
+
+    Args:
+        query: Partial question typed so far.
+        k: Number of documents to prefetch (defaults to config value).
+        namespace: Collection/tenant namespace to search.
+        filters: Optional Pinecone metadata filter (see `build_metadata_filter`).
+
+    Returns:
+        Number of documents cached.
+    """
+    if k is None:
+        k = get_settings().retrieval_k
+    namespace = _resolve_namespace(namespace)
+    embedding = embed_query(query)
+
+    docs = _search(embedding, k, namespace, filters)
+    get_prefetch_cache().put(namespace, filters, k, embedding, docs)
+    return len(docs)
+
+def index_documents(
+    file_path: Path,
+    namespace: str | None = None,
+    tags     : Optional[List[str]] = None,
+) -> int:
+    """Load, split and index a PDF into the Pinecone vector store.
+
+    The PDF is split into large parent sections, which are stored locally in
+    the parent store, and each parent into small child chunks carrying its
+    `parent_id`; only the children are embedded. Every chunk is tagged with
+    `filename`, `tags` and `indexed_at` metadata so that queries can later be
+    narrowed with `build_metadata_filter`.
 
     Args:
-        docs: Documents to embed and upsert into the vector index.
+        file_path: Path to the PDF file on disk.
+        namespace: Collection/tenant namespace to write into.
+        tags: Optional free-form tags attached to every chunk.
 
     Returns:
-        The number of documents indexed.
+        The number of (child) documents indexed.
     """
+    settings = get_settings()
+    namespace = _resolve_namespace(namespace)
+
     loader = PyPDFLoader(str(file_path), mode="single")
     docs = loader.load()
 
-    text_splitter = RecursiveCharacterTextSplitter(chunk_size=500, chunk_overlap=50)
-    texts = text_splitter.split_documents(docs)
+    parent_splitter = RecursiveCharacterTextSplitter(
+        chunk_size    = settings.parent_chunk_size,
+        chunk_overlap = settings.parent_chunk_overlap,
+    )
+    child_splitter = RecursiveCharacterTextSplitter(
+        chunk_size    = settings.child_chunk_size,
+        chunk_overlap = settings.child_chunk_overlap,
+    )
+    parents = parent_splitter.split_documents(docs)
+
+    indexed_at = int(time.time())
+    texts: List[Document] = []
+    for parent in parents:
+        parent.id = uuid.uuid4().hex
+        parent.metadata["filename"] = file_path.name
+        parent.metadata["tags"] = list(tags or [])
+        parent.metadata["indexed_at"] = indexed_at
+
+        for text in child_splitter.split_documents([parent]):
+            text.metadata["parent_id"] = parent.id
+            texts.append(text)
+
+    get_parent_store().put_documents(namespace, parents)
 
     vector_store = _get_vector_store()
-    vector_store.add_documents(texts)
-    return len(texts)
\ No newline at end of file
+    vector_store.add_documents(texts, namespace=namespace)
+
+    # Prefetched results for this namespace may now be missing new chunks
+    get_prefetch_cache().clear(namespace)
+    return len(texts)
@@ -0,0 +1,135 @@
+"""Benchmark the int8 `QuantizedIndex` against an uncompressed float32 scan.
+
+Generates synthetic clustered embeddings (so nearest neighbours are
+meaningful), builds a quantized index on disk, and reports memory per chunk,
+mean/p95 query latency and recall@k relative to the exact float32 search.
+
+Usage::
+
+    python -m src.app.evaluation.index_benchmark --count 1000000 --dim 256 \
+        --queries 50 --k 10 --path data/bench-index
+"""
+
+import argparse
+import statistics
+import tempfile
+import time
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional
+
+import numpy as np
+
+from ..core.retrieval.quantized_index import QuantizedIndex, _normalize_rows
+
+_BATCH_ROWS = 65_536
+
+
+def _synthetic_batches(count: int, dim: int, clusters: int, seed: int) -> Iterator[np.ndarray]:
+    rng = np.random.default_rng(seed)
+    centers = rng.standard_normal((clusters, dim)).astype(np.float32)
+    for start in range(0, count, _BATCH_ROWS):
+        rows = min(_BATCH_ROWS, count - start)
+        assignment = rng.integers(0, clusters, rows)
+        noise = 0.5 * rng.standard_normal((rows, dim)).astype(np.float32)
+        yield centers[assignment] + noise
+
+
+def _exact_top(vectors: np.ndarray, query: np.ndarray, k: int) -> np.ndarray:
+    """Baseline: full float32 scan, blocked like the quantized pass."""
+    scores = np.concatenate([
+        vectors[start:start + _BATCH_ROWS] @ query
+        for start in range(0, len(vectors), _BATCH_ROWS)
+    ])
+    top = np.argpartition(scores, -k)[-k:]
+    return top[np.argsort(-scores[top])]
+
+
+def _latency_summary(samples: List[float]) -> Dict[str, float]:
+    ordered = sorted(samples)
+    return {
+        "mean_ms": round(statistics.fmean(ordered), 2),
+        "p95_ms" : round(ordered[min(len(ordered) - 1, int(0.95 * len(ordered)))], 2),
+    }
+
+
+def run_benchmark(
+    path     : Path,
+    count    : int,
+    dim      : int,
+    queries  : int = 50,
+    k        : int = 10,
+    shortlist: Optional[int] = None,
+    seed     : int = 0,
+) -> Dict[str, Dict[str, float]]:
+    """Build a synthetic index at `path` and compare it with the float32 baseline."""
+    ids = [str(i) for i in range(count)]
+    started = time.perf_counter()
+    index = QuantizedIndex.build(path, ids, _synthetic_batches(count, dim, clusters=1024, seed=seed))
+    build_s = time.perf_counter() - started
+
+    # Baseline holds every normalized float32 vector in memory
+    baseline = np.asarray(index.vectors)
+
+    rng = np.random.default_rng(seed + 1)
+    query_rows = rng.integers(0, count, queries)
+    query_vectors = _normalize_rows(
+        baseline[query_rows] + 0.1 * rng.standard_normal((queries, dim)).astype(np.float32)
+    )
+
+    baseline_ms: List[float] = []
+    quantized_ms: List[float] = []
+    recalls: List[float] = []
+    for query in query_vectors:
+        started = time.perf_counter()
+        exact = _exact_top(baseline, query, k)
+        baseline_ms.append((time.perf_counter() - started) * 1000)
+
+        started = time.perf_counter()
+        approx = index.search(query, k, shortlist=shortlist)
+        quantized_ms.append((time.perf_counter() - started) * 1000)
+
+        exact_ids = {ids[row] for row in exact}
+        recalls.append(len(exact_ids & {chunk_id for chunk_id, _ in approx}) / k)
+
+    return {
+        "float32": {
+            "bytes_per_chunk": dim * 4,
+            **_latency_summary(baseline_ms),
+            "recall_at_k"    : 1.0,
+        },
+        "int8": {
+            "bytes_per_chunk": index.resident_bytes_per_vector(),
+            **_latency_summary(quantized_ms),
+            "recall_at_k"    : round(statistics.fmean(recalls), 4),
+            "build_s"        : round(build_s, 1),
+        },
+    }
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--count", type=int, default=1_000_000, help="Number of vectors")
+    parser.add_argument("--dim", type=int, default=256, help="Embedding dimension")
+    parser.add_argument("--queries", type=int, default=50, help="Number of queries")
+    parser.add_argument("--k", type=int, default=10, help="Results per query")
+    parser.add_argument("--shortlist", type=int, help="Candidates re-scored at full precision")
+    parser.add_argument("--path", type=Path, help="Index directory (default: a temporary directory)")
+    args = parser.parse_args(argv)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        results = run_benchmark(
+            path      = args.path or Path(tmp),
+            count     = args.count,
+            dim       = args.dim,
+            queries   = args.queries,
+            k         = args.k,
+            shortlist = args.shortlist,
+        )
+
+    print(f"{args.count:,} vectors x {args.dim} dims, k={args.k}")
+    for name, metrics in results.items():
+        print(f"  {name:8} " + "  ".join(f"{key}={value}" for key, value in metrics.items()))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,97 @@
+"""Throughput benchmark for a running API server.
+
+Replays the questions of a JSONL dataset (same format as `runner.py`)
+against `/qa` with a fixed number of concurrent clients and reports
+requests per second and latency percentiles. Run it once per worker count
+(`python -m src.app.serve --workers N`) to check how throughput scales.
+Questions are cycled, so once a question has been answered its repeats
+come from the shared answer cache; use at least `--requests` distinct
+questions to measure full pipeline throughput.
+
+Usage::
+
+    python -m src.app.evaluation.load_benchmark questions.jsonl \
+        --url http://localhost:8000 --concurrency 16 --requests 200
+"""
+
+import argparse
+import itertools
+import statistics
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+import httpx
+
+from .runner import load_dataset
+
+
+def run_load(
+    url        : str,
+    items      : List[Dict[str, Any]],
+    requests   : int,
+    concurrency: int,
+    timeout    : float = 120.0,
+) -> Dict[str, Any]:
+    """Send `requests` questions with `concurrency` parallel clients.
+
+    Returns:
+        Throughput, status code counts and latency percentiles.
+    """
+    questions = itertools.cycle(items)
+    lock = threading.Lock()
+    latencies: List[float] = []
+    statuses: Dict[int, int] = {}
+
+    def send(client: httpx.Client) -> None:
+        with lock:
+            item = next(questions)
+        body = {key: item[key] for key in ("question", "namespace", "filters") if item.get(key)}
+
+        started = time.perf_counter()
+        try:
+            code = client.post(f"{url}/qa", json=body).status_code
+        except httpx.HTTPError:
+            code = 0
+        elapsed = (time.perf_counter() - started) * 1000
+
+        with lock:
+            statuses[code] = statuses.get(code, 0) + 1
+            if code == 200:
+                latencies.append(elapsed)
+
+    started = time.perf_counter()
+    with httpx.Client(timeout=timeout) as client, ThreadPoolExecutor(max_workers=concurrency) as pool:
+        for _ in range(requests):
+            pool.submit(send, client)
+    wall_s = time.perf_counter() - started
+
+    ordered = sorted(latencies)
+    return {
+        "requests"      : requests,
+        "concurrency"   : concurrency,
+        "wall_s"        : round(wall_s, 2),
+        "throughput_rps": round(len(ordered) / wall_s, 2) if wall_s else 0.0,
+        "statuses"      : statuses,
+        "latency_p50_ms": round(statistics.median(ordered), 1) if ordered else None,
+        "latency_p95_ms": round(ordered[int(0.95 * (len(ordered) - 1))], 1) if ordered else None,
+    }
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("dataset", type=Path, help="JSONL file of questions")
+    parser.add_argument("--url", default="http://localhost:8000", help="API base URL")
+    parser.add_argument("--concurrency", type=int, default=16, help="Parallel clients")
+    parser.add_argument("--requests", type=int, default=200, help="Total requests to send")
+    args = parser.parse_args(argv)
+
+    report = run_load(args.url.rstrip("/"), load_dataset(args.dataset), args.requests, args.concurrency)
+    for key, value in report.items():
+        print(f"{key:15} {value}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,279 @@
+"""Offline evaluation of answer quality versus latency and token cost.
+
+Runs a labeled question set through `run_qa_flow` under several pipeline
+configurations in parallel and reports, per configuration:
+
+- answer accuracy (token F1 and "contains gold answer" rate),
+- context precision/recall against gold chunks,
+- critic filter rate (share of retrieved chunks the critic dropped),
+- LLM tokens (input, cached input, output), estimated cost and end-to-end
+  latency, overall and per model tier picked by the router.
+
+Dataset format (JSONL, one question per line)::
+
+    {"id": "q1", "question": "...", "answer": "...", "gold_chunks": ["snippet", ...],
+     "namespace": "finance", "filters": {"tags": ["annual"]}}
+
+Only `question` is required. `gold_chunks` entries are matched against
+chunk ids or, case-insensitively, as substrings of the chunk text.
+
+Configurations (JSON object of name -> `PipelineOptions`)::
+
+    {"baseline": {}, "no_critic": {"use_critic": false}, "k2": {"retrieval_k": 2}}
+
+Usage::
+
+    python -m src.app.evaluation.runner questions.jsonl --configs configs.json \
+        --workers 4 --output report.json
+"""
+
+import argparse
+import json
+import re
+import statistics
+import string
+import time
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from ..core.agents.graph import run_qa_flow
+from ..core.agents.state import PipelineOptions
+from ..core.retrieval.chunk_store import get_chunk_store
+from ..core.retrieval.vector_store import build_metadata_filter
+
+DEFAULT_CONFIGS: Dict[str, PipelineOptions] = {
+    "baseline" : {},
+    "no_critic": {"use_critic": False},
+    "k2"       : {"retrieval_k": 2},
+}
+
+
+def load_dataset(path: Path) -> List[Dict[str, Any]]:
+    """Load a JSONL question set, assigning ids to items that lack one."""
+    items = []
+    for line_no, line in enumerate(path.read_text(encoding="utf-8").splitlines(), start=1):
+        if not line.strip():
+            continue
+        item = json.loads(line)
+        if not item.get("question"):
+            raise ValueError(f"{path}:{line_no}: missing `question`")
+        item.setdefault("id", item.get("request_id") or f"q{line_no}")
+        items.append(item)
+    return items
+
+
+def _normalize(text: str) -> str:
+    text = text.lower()
+    text = "".join(ch for ch in text if ch not in string.punctuation)
+    text = re.sub(r"\b(a|an|the)\b", " ", text)
+    return " ".join(text.split())
+
+
+def token_f1(prediction: str, gold: str) -> float:
+    """SQuAD-style token F1 between a predicted and a gold answer."""
+    pred_tokens = _normalize(prediction).split()
+    gold_tokens = _normalize(gold).split()
+    if not pred_tokens or not gold_tokens:
+        return float(pred_tokens == gold_tokens)
+
+    common = Counter(pred_tokens) & Counter(gold_tokens)
+    overlap = sum(common.values())
+    if overlap == 0:
+        return 0.0
+    precision = overlap / len(pred_tokens)
+    recall = overlap / len(gold_tokens)
+    return 2 * precision * recall / (precision + recall)
+
+
+def _matches(gold: str, chunk_id: str, text: str) -> bool:
+    return gold == chunk_id or gold.lower() in text.lower()
+
+
+def context_scores(chunk_ids: List[str], gold_chunks: List[str]) -> Dict[str, Optional[float]]:
+    """Precision/recall of the chunks that reached the summarizer."""
+    if not gold_chunks:
+        return {"context_precision": None, "context_recall": None}
+
+    records = get_chunk_store().get_many(chunk_ids)
+    relevant = [r for r in records if any(_matches(g, r.chunk_id, r.text) for g in gold_chunks)]
+    found = [g for g in gold_chunks if any(_matches(g, r.chunk_id, r.text) for r in records)]
+
+    return {
+        "context_precision": len(relevant) / len(records) if records else 0.0,
+        "context_recall"   : len(found) / len(gold_chunks),
+    }
+
+
+def evaluate_item(config_name: str, options: PipelineOptions, item: Dict[str, Any]) -> Dict[str, Any]:
+    """Run one question under one configuration and score the result."""
+    row: Dict[str, Any] = {"config": config_name, "id": item["id"]}
+    filters = build_metadata_filter(**item["filters"]) if item.get("filters") else None
+
+    started = time.perf_counter()
+    try:
+        result = run_qa_flow(
+            item["question"],
+            namespace=item.get("namespace"),
+            filters=filters,
+            pipeline=options,
+        )
+    except Exception as e:
+        row["error"] = str(e)
+        return row
+    row["latency_ms"] = round((time.perf_counter() - started) * 1000, 1)
+
+    # A critic that kept nothing falls back to every retrieved chunk (see
+    # `render_context`), so that is the context the answer was grounded in
+    retrieved = result.get("chunk_ids") or []
+    kept = result.get("kept_chunk_ids")
+    if kept is not None:
+        kept = kept or retrieved
+        row["critic_filter_rate"] = 1 - len(kept) / len(retrieved) if retrieved else 0.0
+    else:
+        kept = retrieved
+
+    answer = result.get("answer") or ""
+    if item.get("answer"):
+        row["answer_f1"] = token_f1(answer, item["answer"])
+        row["answer_contains"] = float(_normalize(item["answer"]) in _normalize(answer))
+
+    row.update(context_scores(kept, item.get("gold_chunks") or []))
+
+    for node_metrics in (result.get("metrics") or {}).values():
+        for key in ("input_tokens", "cached_input_tokens", "output_tokens", "llm_calls"):
+            row[key] = row.get(key, 0) + node_metrics.get(key, 0)
+        if node_metrics.get("estimated_cost_usd") is not None:
+            row["estimated_cost_usd"] = row.get("estimated_cost_usd", 0.0) + node_metrics["estimated_cost_usd"]
+
+    row["tier"] = (result.get("route") or {}).get("tier")
+
+    row["answer"] = answer
+    return row
+
+
+def _mean(rows: List[Dict[str, Any]], key: str) -> Optional[float]:
+    values = [row[key] for row in rows if row.get(key) is not None]
+    return round(statistics.fmean(values), 6) if values else None
+
+
+def _percentile(values: List[float], pct: float) -> Optional[float]:
+    if not values:
+        return None
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(round(pct * (len(ordered) - 1))))]
+
+
+def _tier_summary(rows: List[Dict[str, Any]]) -> Dict[str, Dict[str, Any]]:
+    """Latency, cost and accuracy per router tier ("default" when unrouted)."""
+    tiers: Dict[str, Dict[str, Any]] = {}
+    for tier in dict.fromkeys(row.get("tier") or "default" for row in rows):
+        tier_rows = [row for row in rows if (row.get("tier") or "default") == tier]
+        latencies = [row["latency_ms"] for row in tier_rows]
+        tiers[tier] = {
+            "questions"         : len(tier_rows),
+            "answer_f1"         : _mean(tier_rows, "answer_f1"),
+            "estimated_cost_usd": _mean(tier_rows, "estimated_cost_usd"),
+            "latency_p50_ms"    : _percentile(latencies, 0.5),
+            "latency_p95_ms"    : _percentile(latencies, 0.95),
+        }
+    return tiers
+
+
+def summarize(rows: List[Dict[str, Any]]) -> Dict[str, Dict[str, Any]]:
+    """Aggregate per-question rows into per-configuration metrics."""
+    summary: Dict[str, Dict[str, Any]] = {}
+    for config_name in dict.fromkeys(row["config"] for row in rows):
+        config_rows = [row for row in rows if row["config"] == config_name]
+        ok_rows = [row for row in config_rows if "error" not in row]
+        latencies = [row["latency_ms"] for row in ok_rows]
+
+        summary[config_name] = {
+            "questions"          : len(config_rows),
+            "errors"             : len(config_rows) - len(ok_rows),
+            "answer_f1"          : _mean(ok_rows, "answer_f1"),
+            "answer_contains"    : _mean(ok_rows, "answer_contains"),
+            "context_precision"  : _mean(ok_rows, "context_precision"),
+            "context_recall"     : _mean(ok_rows, "context_recall"),
+            "critic_filter_rate" : _mean(ok_rows, "critic_filter_rate"),
+            "llm_calls"          : _mean(ok_rows, "llm_calls"),
+            "input_tokens"       : _mean(ok_rows, "input_tokens"),
+            "cached_input_tokens": _mean(ok_rows, "cached_input_tokens"),
+            "output_tokens"      : _mean(ok_rows, "output_tokens"),
+            "estimated_cost_usd" : _mean(ok_rows, "estimated_cost_usd"),
+            "latency_p50_ms"     : _percentile(latencies, 0.5),
+            "latency_p95_ms"     : _percentile(latencies, 0.95),
+            "tiers"              : _tier_summary(ok_rows),
+        }
+    return summary
+
+
+def run_evaluation(
+    items  : List[Dict[str, Any]],
+    configs: Dict[str, PipelineOptions],
+    workers: int = 4,
+) -> Dict[str, Any]:
+    """Evaluate every item under every configuration using a thread pool.
+
+    Returns:
+        Dictionary with per-configuration `summary` and per-question `rows`.
+    """
+    jobs = [(name, options, item) for name, options in configs.items() for item in items]
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        rows = list(pool.map(lambda job: evaluate_item(*job), jobs))
+    return {"summary": summarize(rows), "rows": rows}
+
+
+def format_summary(summary: Dict[str, Dict[str, Any]]) -> str:
+    """Render the per-configuration summary as a plain-text table."""
+    columns = [
+        "questions", "errors", "answer_f1", "answer_contains", "context_precision",
+        "context_recall", "critic_filter_rate", "input_tokens", "cached_input_tokens",
+        "output_tokens", "estimated_cost_usd", "latency_p50_ms", "latency_p95_ms",
+    ]
+    tier_columns = ["questions", "answer_f1", "estimated_cost_usd", "latency_p50_ms", "latency_p95_ms"]
+
+    def table(title: str, rows: Dict[str, Dict[str, Any]], cols: List[str]) -> List[str]:
+        name_width = max([len(title)] + [len(name) for name in rows])
+        header = title.ljust(name_width) + "  " + "  ".join(cols)
+        lines = [header, "-" * len(header)]
+        for name, metrics in rows.items():
+            cells = [
+                ("-" if metrics[col] is None else f"{metrics[col]:g}").rjust(len(col))
+                for col in cols
+            ]
+            lines.append(name.ljust(name_width) + "  " + "  ".join(cells))
+        return lines
+
+    tier_rows = {
+        f"{name}/{tier}": metrics
+        for name, config in summary.items()
+        for tier, metrics in config["tiers"].items()
+    }
+    return "\n".join(
+        table("config", summary, columns) + [""] + table("config/tier", tier_rows, tier_columns)
+    )
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("dataset", type=Path, help="JSONL file of labeled questions")
+    parser.add_argument("--configs", type=Path, help="JSON file of name -> pipeline options")
+    parser.add_argument("--workers", type=int, default=4, help="Parallel graph runs")
+    parser.add_argument("--output", type=Path, help="Write the full JSON report here")
+    args = parser.parse_args(argv)
+
+    items = load_dataset(args.dataset)
+    configs = json.loads(args.configs.read_text(encoding="utf-8")) if args.configs else DEFAULT_CONFIGS
+
+    report = run_evaluation(items, configs, workers=args.workers)
+    print(format_summary(report["summary"]))
+
+    if args.output:
+        args.output.write_text(json.dumps(report, indent=2), encoding="utf-8")
+        print(f"\nFull report written to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,13 +1,42 @@
-from typing import List
-from pydantic import BaseModel
+from datetime import datetime
+from typing import Dict, List
+from pydantic import BaseModel, Field
+
+# Pinecone namespaces double as tenant/collection identifiers; keep them
+# path- and URL-safe since they also name the upload directory.
+NAMESPACE_PATTERN = r"^[A-Za-z0-9_-]{1,64}$"
+
+class RetrievalFilters(BaseModel):
+    """Optional metadata filters narrowing retrieval for a question."""
+    source        : str | None = None        # File name the chunks were indexed from
+    tags          : List[str] | None = None  # Match chunks carrying any of these tags
+    indexed_after : datetime | None = None
+    indexed_before: datetime | None = None
+
+    def to_service_filters(self) -> dict:
+        """Convert into the plain keyword arguments used by the service layer."""
+        return {
+            "source"        : self.source,
+            "tags"          : self.tags,
+            "indexed_after" : self.indexed_after.timestamp() if self.indexed_after else None,
+            "indexed_before": self.indexed_before.timestamp() if self.indexed_before else None,
+        }
 
 class QuestionRequest(BaseModel):
     """Request body for the `/qa` endpoint.
 
     The PRD specifies a single field named `question` that contains
     the user's natural language question about the vector databases paper.
+    `namespace` and `filters` optionally scope retrieval to one collection
+    and a metadata slice of it; `session_id` marks a follow-up question.
+    `request_id` (or an `Idempotency-Key` / `X-Request-ID` header) lets a
+    retried request resume a run that failed part-way.
     """
-    question: str
+    question  : str
+    namespace : str | None = Field(default=None, pattern=NAMESPACE_PATTERN)
+    filters   : RetrievalFilters | None = None
+    session_id: str | None = Field(default=None, max_length=64)   # Continue a conversation
+    request_id: str | None = Field(default=None, max_length=128)  # Reuse when retrying
 
 class QAResponse(BaseModel):
     """Response body for the `/qa` endpoint.
@@ -20,4 +49,7 @@ class QAResponse(BaseModel):
     context               : str
     context_rationale     : str | None = None         # NEW
     chunk_relevance_scores: List[dict] | None = None  # NEW
-    draft_answer          : str | None = None
\ No newline at end of file
+    draft_answer          : str | None = None
+    metrics               : Dict[str, dict] | None = None  # Per-node tokens/latency
+    session_id            : str | None = None              # Pass back to ask follow-ups
+    request_id            : str | None = None              # Echo of the idempotency key
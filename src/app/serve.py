@@ -0,0 +1,42 @@
+"""Multi-worker serving entry point.
+
+Runs the FastAPI app under uvicorn with several worker processes:
+
+    python -m src.app.serve --workers 4 --port 8000
+
+Workers share one listening socket, so consecutive requests of a client
+can land on different workers. All state a later request may need is
+therefore shared: answers, embeddings, sessions, chunks and prefetched
+results through the SQLite store in `SHARED_CACHE_PATH`, run checkpoints
+and request ids through `QA_CHECKPOINT_PATH`, and parent sections through
+the parent store. Indexing is serialized with a file lock, and per-model
+OpenAI rate budgets are divided evenly between workers.
+"""
+
+import argparse
+import os
+from typing import List, Optional
+
+import uvicorn
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Serve the IKMS API with multiple worker processes.")
+    parser.add_argument("--host", default="0.0.0.0")
+    parser.add_argument("--port", type=int, default=8000)
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    args = parser.parse_args(argv)
+
+    # Workers read their settings from the environment they inherit
+    os.environ["SERVE_WORKERS"] = str(args.workers)
+
+    uvicorn.run(
+        "src.app.api:app",
+        host    = args.host,
+        port    = args.port,
+        workers = args.workers,
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,74 @@
+"""Answer cache shared by all serving workers.
+
+First-turn answers depend only on the question, the collection and the
+retrieval filters, so they are cached in the shared store (see
+`core/cache/shared_store.py`) and served to any worker without running the
+graph. Follow-up questions are never cached because their answers depend
+on the conversation. Indexing into a namespace invalidates its answers.
+"""
+
+import hashlib
+import json
+from typing import Any, Dict, Optional
+
+from ..core.cache.shared_store import get_shared_store
+from ..core.config import get_settings
+
+# Result fields worth replaying; graph inputs and metrics are not cached
+_CACHED_FIELDS = (
+    "answer",
+    "context",
+    "context_rationale",
+    "chunk_relevance_scores",
+    "draft_answer",
+    "kept_chunk_ids",
+    "chunk_assessments",
+)
+
+
+def _bucket(namespace: Optional[str]) -> str:
+    return f"answer:{namespace or get_settings().pinecone_default_namespace}"
+
+
+def _key(question: str, filters: Optional[Dict[str, Any]]) -> str:
+    payload = json.dumps(
+        {"question": " ".join(question.lower().split()), "filters": filters},
+        sort_keys=True,
+        default=str,
+    )
+    return hashlib.sha1(payload.encode("utf-8")).hexdigest()
+
+
+def get_cached_answer(
+    question : str,
+    namespace: Optional[str],
+    filters  : Optional[Dict[str, Any]],
+) -> Optional[Dict[str, Any]]:
+    """Return a cached first-turn result, or None on a miss."""
+    cached = get_shared_store().get(_bucket(namespace), _key(question, filters))
+    if cached is None:
+        return None
+    return json.loads(cached)
+
+
+def cache_answer(
+    question : str,
+    namespace: Optional[str],
+    filters  : Optional[Dict[str, Any]],
+    result   : Dict[str, Any],
+) -> None:
+    """Store the replayable fields of a first-turn result."""
+    if not result.get("answer"):
+        return
+    value = json.dumps({field: result.get(field) for field in _CACHED_FIELDS}, default=str)
+    get_shared_store().put(
+        _bucket(namespace),
+        _key(question, filters),
+        value.encode("utf-8"),
+        ttl_seconds=get_settings().answer_cache_ttl_seconds,
+    )
+
+
+def invalidate_answers(namespace: Optional[str]) -> None:
+    """Drop cached answers for a namespace, e.g. after new documents were indexed."""
+    get_shared_store().clear(_bucket(namespace))
@@ -1,19 +1,35 @@
 """Service functions for indexing documents into the vector database."""
 
 from pathlib import Path
+from typing import List, Optional
 
 from langchain_community.document_loaders import PyPDFLoader
 
+from ..core.cache.shared_store import single_writer_lock
+from ..core.config import get_settings
 from ..core.retrieval.vector_store import index_documents
+from .answer_cache import invalidate_answers
 
 
-def index_pdf_file(file_path: Path) -> int:
+def index_pdf_file(
+    file_path: Path,
+    namespace: Optional[str] = None,
+    tags     : Optional[List[str]] = None,
+) -> int:
     """Load a PDF from disk and index it into the vector DB.
 
     Args:
         file_path: Path to the PDF file on disk.
+        namespace: Collection/tenant identifier to index the chunks under.
+        tags: Optional tags stored on every chunk for filtered retrieval.
+
+    Only one serving worker indexes at a time; the others keep answering
+    questions. Cached answers for the namespace are dropped afterwards.
 
     Returns:
         Number of document chunks indexed.
     """
-    return index_documents(file_path)
\ No newline at end of file
+    with single_writer_lock(Path(get_settings().index_lock_path)):
+        indexed = index_documents(file_path, namespace=namespace, tags=tags)
+        invalidate_answers(namespace)
+    return indexed
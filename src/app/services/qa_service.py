@@ -5,18 +5,137 @@ with the multi-agent RAG pipeline without depending directly on LangGraph
 or agent implementation details.
 """
 
-from typing import Dict, Any
+from typing import Dict, Any, Iterator, Optional
 
-from ..core.agents.graph import run_qa_flow
+from ..core.agents.graph import RunConflict, run_qa_flow, stream_qa_flow
+from ..core.config import get_settings
+from ..core.retrieval.vector_store import build_metadata_filter, prefetch
+from .answer_cache import cache_answer, get_cached_answer
+from .session_store import get_session_store
 
 
-def answer_question(question: str) -> Dict[str, Any]:
+def answer_question(
+    question  : str,
+    namespace : Optional[str] = None,
+    filters   : Optional[Dict[str, Any]] = None,
+    session_id: Optional[str] = None,
+    request_id: Optional[str] = None,
+) -> Dict[str, Any]:
     """Run the multi-agent QA flow for a given question.
 
     Args:
         question: User's natural language question about the vector databases paper.
+        namespace: Collection/tenant identifier whose documents should be searched.
+        filters: Optional retrieval filters with `source`, `tags`,
+            `indexed_after` and `indexed_before` keys.
+        session_id: Conversation to continue; a new session is started when
+            omitted, unknown, expired or bound to another namespace/filters.
+            Follow-ups carry over the session's most recently kept chunks.
+        request_id: Idempotency key; retrying a failed request with the same
+            id resumes its run from the last completed agent.
+
+    Raises:
+        RunConflict: `request_id` is in use by a running request or by a
+            failed request with a different question, scope or session.
+
+    Returns:
+        Dictionary containing at least `answer`, `context` and `session_id` keys.
+    """
+    metadata_filter = build_metadata_filter(**filters) if filters else None
+
+    sessions = get_session_store()
+    session = sessions.get_or_create(session_id, namespace, metadata_filter)
+    flow_session = session.to_flow_session(question)
+
+    result = run_qa_flow(
+        question,
+        namespace=namespace,
+        filters=metadata_filter,
+        session=flow_session,
+        request_id=request_id,
+    )
+
+    # Only first turns are cached: follow-up answers depend on the conversation
+    if not flow_session["history"]:
+        cache_answer(question, namespace, metadata_filter, result)
+
+    sessions.record_turn(session, question, result)
+    return {**result, "session_id": session.session_id}
+
+
+def answer_from_cache(
+    question  : str,
+    namespace : Optional[str] = None,
+    filters   : Optional[Dict[str, Any]] = None,
+    session_id: Optional[str] = None,
+) -> Optional[Dict[str, Any]]:
+    """Answer a first-turn question from the shared answer cache, if possible.
+
+    Cache hits cost no LLM calls, so the API serves them before admission
+    control. Questions sent with a `session_id` are follow-ups and always
+    return None, even if the session expired: `answer_question` decides
+    whether they start a new conversation.
+
+    Args:
+        question: User's natural language question about the vector databases paper.
+        namespace: Collection/tenant identifier whose documents should be searched.
+        filters: Optional retrieval filters (see `answer_question`).
+        session_id: Conversation the question belongs to, if any.
+
+    Returns:
+        The same dictionary as `answer_question`, or None on a cache miss.
+    """
+    if session_id:
+        return None
+
+    metadata_filter = build_metadata_filter(**filters) if filters else None
+    result = get_cached_answer(question, namespace, metadata_filter)
+    if result is None:
+        return None
+
+    result["metrics"] = {"answer_cache": {"hit": True}}
+    sessions = get_session_store()
+    session = sessions.get_or_create(namespace=namespace, filters=metadata_filter)
+    sessions.record_turn(session, question, result)
+    return {**result, "session_id": session.session_id}
+
+
+def stream_answer(
+    question : str,
+    namespace: Optional[str] = None,
+    filters  : Optional[Dict[str, Any]] = None,
+) -> Iterator[Dict[str, Any]]:
+    """Run the QA flow, streaming sentence-level verified answer events.
+
+    Args:
+        question: User's natural language question about the vector databases paper.
+        namespace: Collection/tenant identifier whose documents should be searched.
+        filters: Optional retrieval filters (see `answer_question`).
 
     Returns:
-        Dictionary containing at least `answer` and `context` keys.
+        Iterator of event dictionaries (`context`, `sentence`, `answer`).
     """
-    return run_qa_flow(question)
\ No newline at end of file
+    metadata_filter = build_metadata_filter(**filters) if filters else None
+    return stream_qa_flow(question, namespace=namespace, filters=metadata_filter)
+
+
+def prefetch_question(
+    question : str,
+    namespace: Optional[str] = None,
+    filters  : Optional[Dict[str, Any]] = None,
+) -> int:
+    """Warm retrieval results for a partially typed question.
+
+    Args:
+        question: The question as typed so far.
+        namespace: Collection/tenant identifier whose documents should be searched.
+        filters: Optional retrieval filters (see `answer_question`).
+
+    Returns:
+        Number of chunks prefetched (0 if the question is still too short).
+    """
+    if len(question) < get_settings().prefetch_min_chars:
+        return 0
+
+    metadata_filter = build_metadata_filter(**filters) if filters else None
+    return prefetch(question, namespace=namespace, filters=metadata_filter)
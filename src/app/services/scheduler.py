@@ -0,0 +1,373 @@
+"""Admission control and rate-limit aware scheduling for QA requests.
+
+Every `/qa` request fans out into several OpenAI calls. Letting bursts hit
+the provider directly produces 429s, which then surface to users as errors.
+The scheduler sits between the API and the pipeline and:
+
+- bounds the number of concurrently executing graph runs,
+- tracks requests-per-minute and tokens-per-minute budgets per model,
+- queues requests until a slot and budget are available, up to a deadline,
+- sheds load with `SchedulerOverloaded` (mapped to 429 + Retry-After) when
+  the queue is full or the deadline cannot be met,
+- reserves the retrieval and critic calls at admission, and the answer
+  calls once the graph's router has picked their model,
+- replaces each run's estimated usage with the calls and tokens its
+  `metrics` report once it finishes,
+- backs off every budget when any call site reports a provider 429 (see
+  `core/llm/rate_limits.py`), including 429s retried inside the graph.
+
+Retrieval prefetches (one embedding call and one vector search each) hold
+no worker slot, but are capped by their own requests-per-minute budget and
+rejected immediately once it is spent.
+"""
+
+import asyncio
+import math
+import threading
+import time
+from collections import deque
+from contextlib import asynccontextmanager
+from functools import lru_cache
+from typing import Any, AsyncIterator, Callable, Deque, Dict, List, Tuple
+
+from ..core.config import get_settings
+from ..core.llm.rate_limits import add_rate_limit_listener, reserving_calls
+
+# Demand of a single request: model name -> (requests, tokens)
+Demand = Dict[str, Tuple[int, int]]
+
+# Budget entries held by one admitted request: model name -> entry
+Reservation = Dict[str, List[Any]]
+
+
+class SchedulerOverloaded(Exception):
+    """Raised when a request cannot be admitted before its deadline."""
+
+    def __init__(self, retry_after: float, reason: str):
+        super().__init__(reason)
+        self.retry_after = max(1, math.ceil(retry_after))
+        self.reason = reason
+
+
+class ModelBudget:
+    """Sliding-window requests/tokens-per-minute budget for one model.
+
+    Thread-safe: usage is settled and 429s are reported from worker threads.
+    """
+
+    def __init__(self, rpm: int, tpm: int, window: float = 60.0):
+        self.rpm = rpm
+        self.tpm = tpm
+        self.window = window
+        # [reserved_at, requests, tokens], oldest first
+        self._entries: Deque[List[Any]] = deque()
+        self._requests = 0
+        self._tokens = 0
+        self._blocked_until = 0.0
+        self._lock = threading.Lock()
+
+    def _evict(self, now: float) -> None:
+        while self._entries and self._entries[0][0] + self.window <= now:
+            _, requests, tokens = self._entries.popleft()
+            self._requests -= requests
+            self._tokens -= tokens
+
+    def wait_time(self, requests: int, tokens: int, now: float) -> float:
+        """Seconds until `requests`/`tokens` fit in the budget (0 if they fit now)."""
+        with self._lock:
+            return self._wait_time(requests, tokens, now)
+
+    def _wait_time(self, requests: int, tokens: int, now: float) -> float:
+        self._evict(now)
+
+        # A single demand larger than the whole budget waits for an empty window
+        requests = min(requests, self.rpm)
+        tokens = min(tokens, self.tpm)
+
+        wait = max(0.0, self._blocked_until - now)
+        if self._requests + requests <= self.rpm and self._tokens + tokens <= self.tpm:
+            return wait
+
+        used_requests, used_tokens = self._requests, self._tokens
+        for started, entry_requests, entry_tokens in self._entries:
+            used_requests -= entry_requests
+            used_tokens -= entry_tokens
+            if used_requests + requests <= self.rpm and used_tokens + tokens <= self.tpm:
+                return max(wait, started + self.window - now)
+        return max(wait, self.window)
+
+    def reserve(self, requests: int, tokens: int, now: float) -> List[Any]:
+        """Record usage; callers must check `wait_time` first.
+
+        Returns:
+            The budget entry, to be passed to `settle` once the real usage
+            is known.
+        """
+        entry = [now, requests, tokens]
+        with self._lock:
+            self._entries.append(entry)
+            self._requests += requests
+            self._tokens += tokens
+        return entry
+
+    def settle(self, entry: List[Any], requests: int, tokens: int, now: float) -> None:
+        """Replace a reserved estimate with the usage actually observed.
+
+        Entries that already left the window are no longer counted, so they
+        are left alone.
+        """
+        with self._lock:
+            self._evict(now)
+            if entry[0] + self.window <= now:
+                return
+            self._requests += requests - entry[1]
+            self._tokens += tokens - entry[2]
+            entry[1], entry[2] = requests, tokens
+
+    def block_for(self, seconds: float, now: float) -> None:
+        """Stop admitting work for `seconds`, e.g. after a provider 429."""
+        with self._lock:
+            self._blocked_until = max(self._blocked_until, now + seconds)
+
+
+class QAScheduler:
+    """Bounded-concurrency, budget-aware admission queue for graph runs."""
+
+    def __init__(
+        self,
+        max_concurrency: int,
+        max_queue_size : int,
+        queue_timeout  : float,
+        budgets        : Dict[str, ModelBudget],
+        prefetch_budget: ModelBudget,
+    ):
+        self.max_concurrency = max_concurrency
+        self.max_queue_size = max_queue_size
+        self.queue_timeout = queue_timeout
+        self.budgets = budgets
+        self.prefetch_budget = prefetch_budget
+        self._slots = asyncio.Semaphore(max_concurrency)
+        self._waiting = 0
+        self._avg_service_time = 5.0
+
+    def _retry_after_hint(self) -> float:
+        """Rough time until the current queue drains by one request."""
+        return self._avg_service_time * (self._waiting + 1) / self.max_concurrency
+
+    async def _reserve_budgets(self, demand: Demand, deadline: float) -> Reservation:
+        while True:
+            now = time.monotonic()
+            wait = max(
+                (
+                    self.budgets[model].wait_time(requests, tokens, now)
+                    for model, (requests, tokens) in demand.items()
+                    if model in self.budgets
+                ),
+                default=0.0,
+            )
+            if wait <= 0:
+                return {
+                    model: self.budgets[model].reserve(requests, tokens, now)
+                    for model, (requests, tokens) in demand.items()
+                    if model in self.budgets
+                }
+            if now + wait > deadline:
+                raise SchedulerOverloaded(wait, "Model rate-limit budget exhausted")
+            await asyncio.sleep(wait)
+
+    async def acquire(self, demand: Demand) -> Reservation:
+        """Wait for a worker slot and model budget, or raise `SchedulerOverloaded`.
+
+        Returns:
+            The budget reservation, to be corrected with `settle`.
+        """
+        deadline = time.monotonic() + self.queue_timeout
+
+        if self._slots.locked():
+            if self._waiting >= self.max_queue_size:
+                raise SchedulerOverloaded(self._retry_after_hint(), "Request queue is full")
+
+            self._waiting += 1
+            try:
+                await asyncio.wait_for(self._slots.acquire(), timeout=self.queue_timeout)
+            except asyncio.TimeoutError:
+                raise SchedulerOverloaded(
+                    self._retry_after_hint(), "Timed out waiting for a worker slot"
+                ) from None
+            finally:
+                self._waiting -= 1
+        else:
+            await self._slots.acquire()
+
+        try:
+            return await self._reserve_budgets(demand, deadline)
+        except BaseException:
+            self._slots.release()
+            raise
+
+    def release(self, service_time: float | None = None) -> None:
+        """Return a worker slot, updating the service-time estimate."""
+        if service_time is not None:
+            self._avg_service_time = 0.8 * self._avg_service_time + 0.2 * service_time
+        self._slots.release()
+
+    def extend(self, reservation: Reservation, demand: Demand) -> None:
+        """Add `demand` to an admitted request's reservation without waiting.
+
+        Used for calls whose model is only known mid-run; the budget may
+        briefly overrun, which later admissions wait out.
+        """
+        now = time.monotonic()
+        for model, (requests, tokens) in demand.items():
+            budget = self.budgets.get(model)
+            if budget is None:
+                continue
+            if model in reservation:
+                entry = reservation[model]
+                budget.settle(entry, entry[1] + requests, entry[2] + tokens, now)
+            else:
+                reservation[model] = budget.reserve(requests, tokens, now)
+
+    def settle(self, reservation: Reservation, usage: Demand) -> None:
+        """Correct a reservation with a run's actual usage per model.
+
+        Models the run used without a reservation are charged as well.
+        """
+        now = time.monotonic()
+        for model in dict.fromkeys([*reservation, *usage]):
+            budget = self.budgets.get(model)
+            if budget is None:
+                continue
+            requests, tokens = usage.get(model, (0, 0))
+            if model in reservation:
+                budget.settle(reservation[model], requests, tokens, now)
+            elif requests or tokens:
+                budget.reserve(requests, tokens, now)
+
+    @asynccontextmanager
+    async def admit(self, demand: Demand) -> AsyncIterator[Reservation]:
+        """Hold a worker slot and budget reservation for the enclosed block."""
+        reservation = await self.acquire(demand)
+        started = time.monotonic()
+        try:
+            yield reservation
+        finally:
+            self.release(time.monotonic() - started)
+
+    async def run(self, demand: Demand, func: Callable[..., Any], *args: Any, **kwargs: Any) -> Any:
+        """Admit a request and execute the blocking `func` in a worker thread.
+
+        Calls `func` reserves with `reserve_calls` are added to the
+        reservation. If `func` returns a result with `metrics`, the
+        reservation is settled with the usage they report.
+        """
+        async with self.admit(demand) as reservation:
+            with reserving_calls(lambda model, calls: self.extend(reservation, _add_calls({}, model, calls))):
+                result = await asyncio.to_thread(func, *args, **kwargs)
+        if isinstance(result, dict) and result.get("metrics"):
+            self.settle(reservation, usage_from_metrics(result["metrics"]))
+        return result
+
+    def admit_prefetch(self) -> None:
+        """Reserve one prefetch, or raise `SchedulerOverloaded` without queueing.
+
+        Prefetching is best-effort, so an exhausted budget rejects the call
+        instead of delaying it.
+        """
+        now = time.monotonic()
+        wait = self.prefetch_budget.wait_time(1, 0, now)
+        if wait > 0:
+            raise SchedulerOverloaded(wait, "Prefetch budget exhausted")
+        self.prefetch_budget.reserve(1, 0, now)
+
+    def report_rate_limited(self, retry_after: float) -> None:
+        """Back off every model budget after the provider returned a 429."""
+        now = time.monotonic()
+        for budget in self.budgets.values():
+            budget.block_for(retry_after, now)
+
+
+def usage_from_metrics(metrics: Dict[str, Any]) -> Demand:
+    """Actual OpenAI usage per model from a run's per-node `metrics`."""
+    usage: Demand = {}
+    for node_metrics in metrics.values():
+        model = node_metrics.get("model") if isinstance(node_metrics, dict) else None
+        if not model:
+            continue
+        requests, tokens = usage.get(model, (0, 0))
+        usage[model] = (
+            requests + node_metrics.get("llm_calls", 0),
+            tokens + node_metrics.get("input_tokens", 0) + node_metrics.get("output_tokens", 0),
+        )
+    return usage
+
+
+def _add_calls(demand: Demand, model_name: str, calls: int) -> Demand:
+    """Add the estimated usage of `calls` OpenAI calls on one model to `demand`."""
+    requests, tokens = demand.get(model_name, (0, 0))
+    demand[model_name] = (requests + calls, tokens + calls * get_settings().qa_estimated_tokens_per_call)
+    return demand
+
+
+def qa_demand() -> Demand:
+    """Estimated OpenAI usage of one QA graph run at admission, per model.
+
+    The retrieval agent makes two calls (tool call + final message) on the
+    main model and the context critic one call on its own model. The
+    summarization and verification calls are reserved by the router node
+    once it has picked their model (see `QAScheduler.run`).
+    """
+    settings = get_settings()
+    demand = _add_calls({}, settings.openai_model_name, 2)
+    return _add_calls(demand, settings.openai_critic_model_name, 1)
+
+
+def stream_demand() -> Demand:
+    """Estimated OpenAI usage of one streamed answer, per model.
+
+    Streaming skips the router and answers on the main model, so its
+    summarization and verification calls are reserved at admission.
+    """
+    return _add_calls(qa_demand(), get_settings().openai_model_name, 2)
+
+
+@lru_cache(maxsize=1)
+def get_scheduler() -> QAScheduler:
+    """Get the process-wide QA scheduler (singleton via LRU cache)."""
+    settings = get_settings()
+    # Provider limits are per account: split them across serving workers
+    workers = max(1, settings.serve_workers)
+
+    budgets = {
+        settings.openai_model_name: ModelBudget(
+            rpm=settings.openai_rpm_limit // workers,
+            tpm=settings.openai_tpm_limit // workers,
+        ),
+    }
+    # Roles share one provider bucket when they use the same model
+    budgets.setdefault(
+        settings.openai_critic_model_name,
+        ModelBudget(
+            rpm=settings.openai_critic_rpm_limit // workers,
+            tpm=settings.openai_critic_tpm_limit // workers,
+        ),
+    )
+    budgets.setdefault(
+        settings.openai_fast_model_name,
+        ModelBudget(
+            rpm=settings.openai_fast_rpm_limit // workers,
+            tpm=settings.openai_fast_tpm_limit // workers,
+        ),
+    )
+
+    scheduler = QAScheduler(
+        max_concurrency = settings.qa_max_concurrency,
+        max_queue_size  = settings.qa_max_queue_size,
+        queue_timeout   = settings.qa_queue_timeout_seconds,
+        budgets         = budgets,
+        # Only requests are limited: prefetches reserve no tokens
+        prefetch_budget = ModelBudget(rpm=max(1, settings.prefetch_rpm_limit // workers), tpm=0),
+    )
+    # 429s retried inside the graph or hit while streaming back off admission too
+    add_rate_limit_listener(scheduler.report_rate_limited)
+    return scheduler
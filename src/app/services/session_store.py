@@ -0,0 +1,205 @@
+"""Server-side conversation sessions for follow-up questions.
+
+A session remembers, for a short time, what earlier turns already paid for:
+the recent questions (so follow-ups can be resolved), the chunks the critic
+kept, and the critic's verdicts. A session is bound to the namespace and
+filters of its first turn; a turn with a different scope starts a new
+session so chunks never cross collections. Sessions live in the shared
+store, so any serving worker can answer the next turn.
+
+Verdicts are reused so a follow-up does not pay for chunks twice: a chunk
+carried over from an earlier turn keeps the verdict it was kept with, and
+when the same question is asked again all of its verdicts are reused. The
+critic only assesses newly retrieved chunks. A carried chunk's verdict was
+given for the question that kept it, so an off-topic carried chunk is
+still passed on to the answer; keeping the carry-over small
+(`session_carryover_chunks`) bounds that noise.
+"""
+
+import json
+import uuid
+from collections import OrderedDict, deque
+from functools import lru_cache
+from typing import Any, Deque, Dict, List, Optional, Tuple
+
+from ..core.cache.shared_store import SharedStore, get_shared_store
+from ..core.config import get_settings
+
+_BUCKET = "session"
+
+
+def _question_key(question: str) -> str:
+    return " ".join(question.lower().split())
+
+
+class Session:
+    """State carried between the turns of one conversation."""
+
+    def __init__(
+        self,
+        session_id      : str,
+        scope           : Tuple[str, Optional[Dict[str, Any]]],
+        history_turns   : int,
+        max_chunks      : int,
+        carryover_chunks: int,
+    ):
+        self.session_id = session_id
+        self.scope = scope
+        self.max_chunks = max_chunks
+        self.carryover_chunks = carryover_chunks
+        self.questions: Deque[str] = deque(maxlen=history_turns)
+        self.kept_chunk_ids: List[str] = []
+        # Verdict each kept chunk was last kept with, by chunk id
+        self.kept_verdicts: Dict[str, dict] = {}
+        # Critic verdicts by normalized question, then chunk id
+        self.assessments: "OrderedDict[str, Dict[str, dict]]" = OrderedDict()
+
+    def to_json(self) -> bytes:
+        return json.dumps({
+            "scope"         : list(self.scope),
+            "questions"     : list(self.questions),
+            "kept_chunk_ids": self.kept_chunk_ids,
+            "kept_verdicts" : self.kept_verdicts,
+            "assessments"   : list(self.assessments.items()),
+        }).encode("utf-8")
+
+    def load_json(self, value: bytes) -> "Session":
+        """Replace this session's turns with a stored copy; returns the session."""
+        data = json.loads(value)
+        self.scope = tuple(data["scope"])
+        self.questions.clear()
+        self.questions.extend(data["questions"])
+        self.kept_chunk_ids = data["kept_chunk_ids"]
+        self.kept_verdicts = data["kept_verdicts"]
+        self.assessments = OrderedDict(data["assessments"])
+        return self
+
+    def to_flow_session(self, question: str) -> Dict[str, Any]:
+        """Snapshot passed to `run_qa_flow` for the next turn.
+
+        Only the most recently kept chunks are carried over, with the
+        verdicts they were kept with; verdicts given for this same question
+        take precedence.
+        """
+        carried = self.kept_chunk_ids[: self.carryover_chunks]
+        cached = {cid: self.kept_verdicts[cid] for cid in carried if cid in self.kept_verdicts}
+        cached.update(self.assessments.get(_question_key(question), {}))
+        return {
+            "history"           : list(self.questions),
+            "session_chunk_ids" : carried,
+            "cached_assessments": cached,
+        }
+
+    def record_turn(self, question: str, result: Dict[str, Any]) -> None:
+        """Remember the question, kept chunks and verdicts of a finished turn."""
+        self.questions.append(question)
+
+        turn_verdicts = result.get("chunk_assessments") or {}
+        turn_kept = result.get("kept_chunk_ids") or []
+        kept = [cid for cid in turn_kept if cid not in self.kept_chunk_ids]
+        self.kept_chunk_ids = (kept + self.kept_chunk_ids)[: self.max_chunks]
+        for cid in turn_kept:
+            if turn_verdicts.get(cid, {}).get("keep"):
+                self.kept_verdicts[cid] = turn_verdicts[cid]
+        self.kept_verdicts = {
+            cid: self.kept_verdicts[cid] for cid in self.kept_chunk_ids if cid in self.kept_verdicts
+        }
+
+        key = _question_key(question)
+        verdicts = self.assessments.pop(key, {})
+        verdicts.update(turn_verdicts)
+        self.assessments[key] = verdicts
+        # Keep verdicts for the questions still in the history only
+        while len(self.assessments) > (self.questions.maxlen or 1):
+            self.assessments.popitem(last=False)
+
+
+class SessionStore:
+    """Sessions kept in the shared store, so any serving worker can continue them.
+
+    Sessions expire `ttl_seconds` after their last turn; the shared store's
+    size bound caps how many are kept.
+    """
+
+    def __init__(
+        self,
+        store           : SharedStore,
+        ttl_seconds     : float,
+        history_turns   : int,
+        max_chunks      : int,
+        carryover_chunks: int,
+    ):
+        self.store = store
+        self.ttl_seconds = ttl_seconds
+        self.history_turns = history_turns
+        self.max_chunks = max_chunks
+        self.carryover_chunks = carryover_chunks
+
+    def _new_session(self, session_id: str, scope: Tuple[str, Optional[Dict[str, Any]]]) -> Session:
+        return Session(
+            session_id       = session_id,
+            scope            = scope,
+            history_turns    = self.history_turns,
+            max_chunks       = self.max_chunks,
+            carryover_chunks = self.carryover_chunks,
+        )
+
+    def get(
+        self,
+        session_id: Optional[str],
+        namespace : Optional[str] = None,
+        filters   : Optional[Dict[str, Any]] = None,
+    ) -> Optional[Session]:
+        """Return the live session with this id and scope, or None."""
+        scope = (namespace or get_settings().pinecone_default_namespace, filters)
+        stored = self.store.get(_BUCKET, session_id) if session_id else None
+        if stored is None:
+            return None
+        session = self._new_session(session_id, scope).load_json(stored)
+        return session if session.scope == scope else None
+
+    def get_or_create(
+        self,
+        session_id: Optional[str] = None,
+        namespace : Optional[str] = None,
+        filters   : Optional[Dict[str, Any]] = None,
+    ) -> Session:
+        """Return a live session for this scope, or a new one.
+
+        A new session - always with a server-generated id - is started when
+        `session_id` is unknown or expired, or when the session was started
+        for a different namespace or different filters. New sessions are
+        only stored once their first turn is recorded.
+        """
+        session = self.get(session_id, namespace, filters)
+        if session is None:
+            scope = (namespace or get_settings().pinecone_default_namespace, filters)
+            session = self._new_session(uuid.uuid4().hex, scope)
+        return session
+
+    def record_turn(self, session: Session, question: str, result: Dict[str, Any]) -> None:
+        """Add a finished turn to a session and store it.
+
+        The turn is applied to the latest stored copy, so turns of the same
+        session finishing on different workers are all kept.
+        """
+        def apply(stored: Optional[bytes]) -> bytes:
+            if stored is not None:
+                session.load_json(stored)
+            session.record_turn(question, result)
+            return session.to_json()
+
+        self.store.update(_BUCKET, session.session_id, apply, ttl_seconds=self.ttl_seconds)
+
+
+@lru_cache(maxsize=1)
+def get_session_store() -> SessionStore:
+    """Get this process's handle on the session store (singleton via LRU cache)."""
+    settings = get_settings()
+    return SessionStore(
+        store            = get_shared_store(),
+        ttl_seconds      = settings.session_ttl_seconds,
+        history_turns    = settings.session_history_turns,
+        max_chunks       = settings.session_max_chunks,
+        carryover_chunks = settings.session_carryover_chunks,
+    )
@@ -0,0 +1,7 @@
+"""Shared pytest setup: settings need credentials even when no call is made."""
+
+import os
+
+os.environ.setdefault("OPENAI_API_KEY", "test-openai-key")
+os.environ.setdefault("PINECONE_API_KEY", "test-pinecone-key")
+os.environ.setdefault("PINECONE_INDEX_NAME", "test-index")
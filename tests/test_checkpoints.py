@@ -0,0 +1,48 @@
+import pytest
+
+from src.app.core.agents.checkpoints import RunConflict, RunRegistry
+
+
+def _registry(tmp_path, **overrides) -> RunRegistry:
+    options = dict(path=tmp_path / "checkpoints.sqlite3", max_failed=2, lease_seconds=60.0)
+    options.update(overrides)
+    return RunRegistry(**options)
+
+
+def test_running_request_id_is_rejected_by_every_worker(tmp_path):
+    first, second = _registry(tmp_path), _registry(tmp_path)
+    assert first.claim("r1", "fp") is False
+
+    with pytest.raises(RunConflict, match="already in progress"):
+        second.claim("r1", "fp")
+
+    first.release("r1")
+    assert second.claim("r1", "fp") is False
+
+
+def test_failed_run_is_resumed_only_with_the_same_input(tmp_path):
+    first, second = _registry(tmp_path), _registry(tmp_path)
+    first.claim("r1", "fp")
+    first.fail("r1", "fp")
+
+    with pytest.raises(RunConflict, match="different question"):
+        second.claim("r1", "other")
+    assert second.claim("r1", "fp") is True
+
+
+def test_abandoned_run_can_be_claimed_after_its_lease(tmp_path):
+    registry = _registry(tmp_path, lease_seconds=0.0)
+    registry.claim("r1", "fp")
+
+    assert registry.claim("r1", "fp") is True
+
+
+def test_oldest_failed_runs_beyond_the_cap_are_dropped(tmp_path):
+    registry = _registry(tmp_path)
+    for thread_id in ("r1", "r2"):
+        registry.claim(thread_id, "fp")
+        assert registry.fail(thread_id, "fp") == []
+
+    registry.claim("r3", "fp")
+    assert registry.fail("r3", "fp") == ["r1"]
+    assert registry.claim("r1", "other") is False
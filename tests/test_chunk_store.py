@@ -0,0 +1,31 @@
+from langchain_core.documents import Document
+
+from src.app.core.cache.shared_store import SharedStore
+from src.app.core.retrieval.chunk_store import ChunkStore
+
+
+def _doc(i):
+    return Document(id=f"c{i}", page_content=f" Chunk {i} text ", metadata={"source": "a.pdf", "page": i})
+
+
+def test_records_are_returned_in_order_and_oldest_writes_evicted():
+    store = ChunkStore(max_chunks=2)
+    assert store.put_documents([_doc(1), _doc(2)]) == ["c1", "c2"]
+    store.put_documents([_doc(1), _doc(3)])
+
+    assert [r.chunk_id for r in store.get_many(["c3", "c2", "c1"])] == ["c3", "c1"]
+    assert store.get("c1").text == "Chunk 1 text"
+
+
+def test_records_from_another_worker_are_read_from_the_shared_store(tmp_path):
+    shared_path = tmp_path / "shared.sqlite3"
+    retrieving = ChunkStore(max_chunks=10, shared=SharedStore(shared_path))
+    answering = ChunkStore(max_chunks=10, shared=SharedStore(shared_path))
+    retrieving.put_documents([_doc(1), _doc(2)])
+
+    records = answering.get_many(["c2", "unknown", "c1"])
+    assert [(r.chunk_id, r.text, r.source, r.page) for r in records] == [
+        ("c2", "Chunk 2 text", "a.pdf", 2),
+        ("c1", "Chunk 1 text", "a.pdf", 1),
+    ]
+    assert len(answering) == 2
@@ -0,0 +1,31 @@
+from src.app.evaluation import runner
+
+
+def _evaluate(monkeypatch, result):
+    monkeypatch.setattr(runner, "run_qa_flow", lambda *args, **kwargs: result)
+    monkeypatch.setattr(
+        runner, "context_scores",
+        lambda chunk_ids, gold: {"context_precision": None, "context_recall": None, "scored": list(chunk_ids)},
+    )
+    return runner.evaluate_item("baseline", {}, {"id": "q1", "question": "What?"})
+
+
+def test_critic_that_kept_nothing_is_scored_on_all_retrieved_chunks(monkeypatch):
+    row = _evaluate(monkeypatch, {"chunk_ids": ["a", "b"], "kept_chunk_ids": [], "answer": "x"})
+
+    assert row["critic_filter_rate"] == 0.0
+    assert row["scored"] == ["a", "b"]
+
+
+def test_critic_filter_rate_counts_dropped_chunks(monkeypatch):
+    row = _evaluate(monkeypatch, {"chunk_ids": ["a", "b", "c", "d"], "kept_chunk_ids": ["c"], "answer": "x"})
+
+    assert row["critic_filter_rate"] == 0.75
+    assert row["scored"] == ["c"]
+
+
+def test_without_critic_every_retrieved_chunk_is_scored(monkeypatch):
+    row = _evaluate(monkeypatch, {"chunk_ids": ["a", "b"], "answer": "x"})
+
+    assert "critic_filter_rate" not in row
+    assert row["scored"] == ["a", "b"]
@@ -0,0 +1,37 @@
+import numpy as np
+from langchain_core.documents import Document
+
+from src.app.core.cache.shared_store import SharedStore
+from src.app.core.retrieval.prefetch import PrefetchCache
+
+
+def _cache(path, **overrides) -> PrefetchCache:
+    options = dict(store=SharedStore(path), ttl_seconds=30, max_entries=8, min_similarity=0.9)
+    options.update(overrides)
+    return PrefetchCache(**options)
+
+
+def _docs(count):
+    return [Document(id=f"c{i}", page_content=f"chunk {i}", metadata={"page": i}) for i in range(count)]
+
+
+def test_results_prefetched_by_one_worker_are_found_by_another(tmp_path):
+    prefetching = _cache(tmp_path / "shared.sqlite3")
+    answering = _cache(tmp_path / "shared.sqlite3")
+    prefetching.put("docs", {"source": "a.pdf"}, 4, [1.0, 0.0, 0.1], _docs(4))
+
+    docs = answering.lookup("docs", {"source": "a.pdf"}, 2, np.array([1.0, 0.0, 0.12]))
+    assert [(doc.id, doc.metadata["page"]) for doc in docs] == [("c0", 0), ("c1", 1)]
+
+
+def test_lookup_requires_same_scope_enough_results_and_similarity(tmp_path):
+    cache = _cache(tmp_path / "shared.sqlite3")
+    cache.put("docs", None, 2, [1.0, 0.0], _docs(2))
+
+    assert cache.lookup("other", None, 2, [1.0, 0.0]) is None
+    assert cache.lookup("docs", {"source": "a.pdf"}, 2, [1.0, 0.0]) is None
+    assert cache.lookup("docs", None, 4, [1.0, 0.0]) is None
+    assert cache.lookup("docs", None, 2, [0.0, 1.0]) is None
+
+    cache.clear("docs")
+    assert cache.lookup("docs", None, 2, [1.0, 0.0]) is None
@@ -0,0 +1,55 @@
+import numpy as np
+import pytest
+
+from src.app.core.retrieval.quantized_index import QuantizedIndex, quantize
+
+
+def _vectors(count=50, dim=16, seed=0):
+    return np.random.default_rng(seed).normal(size=(count, dim)).astype(np.float32)
+
+
+def test_quantize_round_trips_within_one_step():
+    vectors = _vectors()
+    codes, scales = quantize(vectors)
+
+    assert codes.dtype == np.int8
+    assert np.all(np.abs(codes.astype(np.float32) * scales[:, None] - vectors) <= scales[:, None] / 2 + 1e-6)
+
+
+def test_search_matches_exact_cosine_ranking(tmp_path):
+    vectors = _vectors()
+    ids = [f"c{i}" for i in range(len(vectors))]
+    index = QuantizedIndex.build(tmp_path, ids, [vectors[:20], vectors[20:]])
+
+    query = vectors[7] + 0.01
+    normalized = vectors / np.linalg.norm(vectors, axis=1, keepdims=True)
+    expected = np.argsort(-(normalized @ (query / np.linalg.norm(query))))[:5]
+
+    results = index.search(query, k=5)
+    assert [chunk_id for chunk_id, _ in results] == [ids[i] for i in expected]
+    assert results[0][0] == "c7"
+    assert results[0][1] == pytest.approx(1.0, abs=1e-3)
+
+
+def test_reopened_index_keeps_ids_and_dimension(tmp_path):
+    vectors = _vectors(count=10, dim=8)
+    QuantizedIndex.build(tmp_path, [str(i) for i in range(10)], [vectors])
+
+    index = QuantizedIndex(tmp_path)
+    assert len(index) == 10
+    assert index.dim == 8
+    assert index.resident_bytes_per_vector() == 8 + 4
+    assert index.search(vectors[3], k=1)[0][0] == "3"
+
+
+def test_empty_index_records_dimension_and_returns_nothing(tmp_path):
+    index = QuantizedIndex.build(tmp_path, [], [], dim=8)
+
+    assert len(index) == 0
+    assert QuantizedIndex(tmp_path).dim == 8
+    assert index.search(np.ones(8), k=3) == []
+
+
+def test_build_rejects_id_and_embedding_count_mismatch(tmp_path):
+    with pytest.raises(ValueError, match="Expected 3 embeddings, got 2"):
+        QuantizedIndex.build(tmp_path, ["a", "b", "c"], [_vectors(count=2)])
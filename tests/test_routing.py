@@ -0,0 +1,71 @@
+from langchain_core.messages import AIMessage
+
+from src.app.core.agents import agents, routing
+from src.app.core.config import get_settings
+from src.app.core.llm.rate_limits import reserving_calls
+
+
+class FakeAgent:
+    def __init__(self, content: str, finish_reason: str = "stop"):
+        self.reply = AIMessage(
+            content           = content,
+            response_metadata = {"finish_reason": finish_reason},
+            usage_metadata    = {"input_tokens": 10, "output_tokens": 5, "total_tokens": 15},
+        )
+
+    def invoke(self, _):
+        return {"messages": [self.reply]}
+
+
+def _route(tier: str) -> dict:
+    state = {"question": "q", "pipeline": {"model_tier": tier}}
+    return routing.router_node(state)["route"]
+
+
+def _reserved(state: dict) -> list:
+    calls = []
+    with reserving_calls(lambda model, count: calls.append((model, count))):
+        routing.router_node(state)
+    return calls
+
+
+def test_router_reserves_answer_calls_on_the_chosen_tier():
+    settings = get_settings()
+
+    assert _reserved({"question": "q", "pipeline": {"model_tier": "fast"}}) == [
+        (settings.openai_fast_model_name, 1),
+        (settings.openai_fast_model_name, 1),
+    ]
+    assert _reserved({"question": "q", "pipeline": {"model_name": "pinned"}}) == [("pinned", 2)]
+
+
+def test_fast_verification_gets_more_headroom_than_summarization():
+    route = _route("fast")
+    assert route["verification"]["max_tokens"] > route["summarization"]["max_tokens"]
+    assert route["fallback"]["tier"] == "standard"
+    assert "fallback" not in _route("standard")
+
+
+def test_truncated_fast_draft_is_regenerated_on_the_standard_tier(monkeypatch):
+    route = _route("fast")
+    monkeypatch.setattr(agents, "render_context", lambda state: "context")
+    monkeypatch.setattr(agents, "_answer_agent", lambda role, state: (FakeAgent("cut", "length"), "fast-model", "fast"))
+    monkeypatch.setattr(agents, "_agent_for", lambda role, model_name, max_tokens=None: FakeAgent("full draft"))
+
+    update = agents.summarization_node({"question": "q", "route": route})
+    assert update["draft_answer"] == "full draft"
+    assert update["metrics"]["summarization"]["truncated"] is True
+    assert update["metrics"]["summarization_rerun"]["tier"] == "standard"
+    # Verification follows the draft onto the standard tier
+    assert update["route"]["tier"] == "standard"
+    assert update["route"]["verification"] == route["fallback"]["verification"]
+    assert update["route"]["fallback"] is None
+
+
+def test_truncated_verification_falls_back_to_the_draft(monkeypatch):
+    monkeypatch.setattr(agents, "render_context", lambda state: "context")
+    monkeypatch.setattr(agents, "_answer_agent", lambda role, state: (FakeAgent("cut", "length"), "fast-model", "fast"))
+
+    update = agents.verification_node({"question": "q", "draft_answer": "the draft"})
+    assert update["answer"] == "the draft"
+    assert update["metrics"]["verification"]["truncated"] is True
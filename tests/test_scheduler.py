@@ -0,0 +1,134 @@
+import asyncio
+
+import pytest
+
+from src.app.core.llm.rate_limits import add_rate_limit_listener, report_rate_limited, reserve_calls
+from src.app.services.scheduler import (
+    ModelBudget,
+    QAScheduler,
+    SchedulerOverloaded,
+    qa_demand,
+    stream_demand,
+    usage_from_metrics,
+)
+
+
+def _scheduler(**budgets: ModelBudget) -> QAScheduler:
+    return QAScheduler(
+        max_concurrency = 2,
+        max_queue_size  = 2,
+        queue_timeout   = 0.1,
+        budgets         = budgets,
+        prefetch_budget = ModelBudget(rpm=2, tpm=0),
+    )
+
+
+def test_budget_waits_for_oldest_entry_to_leave_window():
+    budget = ModelBudget(rpm=2, tpm=1000, window=60.0)
+    budget.reserve(1, 100, now=0.0)
+    budget.reserve(1, 100, now=10.0)
+
+    assert budget.wait_time(1, 100, now=20.0) == pytest.approx(40.0)
+    assert budget.wait_time(1, 100, now=60.0) == 0.0
+
+
+def test_budget_settle_replaces_estimate_with_actual_usage():
+    budget = ModelBudget(rpm=10, tpm=1000, window=60.0)
+    entry = budget.reserve(5, 900, now=0.0)
+    assert budget.wait_time(1, 200, now=1.0) > 0
+
+    budget.settle(entry, 2, 300, now=1.0)
+    assert budget.wait_time(1, 200, now=1.0) == 0.0
+
+
+def test_budget_settle_ignores_entries_that_left_the_window():
+    budget = ModelBudget(rpm=10, tpm=1000, window=60.0)
+    entry = budget.reserve(5, 900, now=0.0)
+    budget.settle(entry, 0, 0, now=61.0)
+    budget.reserve(10, 1000, now=61.0)
+
+    assert budget.wait_time(1, 1, now=62.0) > 0
+
+
+def test_block_for_delays_admission():
+    budget = ModelBudget(rpm=10, tpm=1000)
+    budget.block_for(5.0, now=0.0)
+    assert budget.wait_time(1, 1, now=1.0) == pytest.approx(4.0)
+
+
+def test_usage_from_metrics_sums_calls_and_tokens_per_model():
+    metrics = {
+        "retrieval"     : {"model": "a", "llm_calls": 2, "input_tokens": 100, "output_tokens": 10},
+        "context_critic": {"model": "b", "llm_calls": 1, "input_tokens": 50, "output_tokens": 5},
+        "verification"  : {"model": "a", "llm_calls": 1, "input_tokens": 20, "output_tokens": 20},
+        "router"        : {"tier": "fast"},
+    }
+    assert usage_from_metrics(metrics) == {"a": (3, 150), "b": (1, 55)}
+
+
+def test_run_settles_reservation_with_result_metrics():
+    scheduler = _scheduler(a=ModelBudget(rpm=10, tpm=10_000))
+
+    def answer():
+        return {"metrics": {"retrieval": {"model": "a", "llm_calls": 1, "input_tokens": 10, "output_tokens": 0}}}
+
+    asyncio.run(scheduler.run({"a": (5, 5000)}, answer))
+    assert scheduler.budgets["a"].wait_time(9, 9990, now=scheduler.budgets["a"]._entries[0][0]) == 0.0
+
+
+def test_run_adds_calls_reserved_mid_run_to_the_reservation():
+    scheduler = _scheduler(a=ModelBudget(rpm=10, tpm=100_000), b=ModelBudget(rpm=10, tpm=100_000))
+    seen = {}
+
+    def answer():
+        reserve_calls("a", 2)
+        reserve_calls("b", 1)
+        seen["a"] = scheduler.budgets["a"]._requests
+        seen["b"] = scheduler.budgets["b"]._requests
+        return {}
+
+    asyncio.run(scheduler.run({"a": (3, 3000)}, answer))
+    assert seen == {"a": 5, "b": 1}
+    # Outside an admitted run there is nothing to reserve against
+    reserve_calls("a", 1)
+    assert scheduler.budgets["a"]._requests == 5
+
+
+def test_answer_calls_are_only_reserved_up_front_for_streaming():
+    admitted, streamed = qa_demand(), stream_demand()
+
+    assert sum(requests for requests, _ in admitted.values()) == 3
+    assert sum(requests for requests, _ in streamed.values()) == 5
+
+
+def test_acquire_rejects_demand_that_cannot_fit_before_deadline():
+    scheduler = _scheduler(a=ModelBudget(rpm=1, tpm=10_000))
+
+    async def admit_twice():
+        await scheduler.acquire({"a": (1, 10)})
+        scheduler.release()
+        await scheduler.acquire({"a": (1, 10)})
+
+    with pytest.raises(SchedulerOverloaded):
+        asyncio.run(admit_twice())
+
+
+def test_admit_prefetch_rejects_beyond_budget():
+    scheduler = _scheduler()
+    scheduler.admit_prefetch()
+    scheduler.admit_prefetch()
+    with pytest.raises(SchedulerOverloaded):
+        scheduler.admit_prefetch()
+
+
+def test_reported_rate_limits_reach_listeners():
+    class FakeResponse:
+        headers = {"retry-after": "7"}
+
+    class FakeRateLimit(Exception):
+        response = FakeResponse()
+
+    seen = []
+    add_rate_limit_listener(seen.append)
+    report_rate_limited(FakeRateLimit())
+    assert seen == [7.0]
@@ -0,0 +1,116 @@
+import pytest
+
+from src.app.core.cache.shared_store import SharedStore
+from src.app.services.session_store import SessionStore
+
+
+@pytest.fixture
+def shared(tmp_path):
+    return SharedStore(tmp_path / "shared.sqlite3")
+
+
+def _store(shared, **overrides) -> SessionStore:
+    options = dict(
+        store            = shared,
+        ttl_seconds      = 60,
+        history_turns    = 3,
+        max_chunks       = 4,
+        carryover_chunks = 2,
+    )
+    options.update(overrides)
+    return SessionStore(**options)
+
+
+def _verdict(keep: bool) -> dict:
+    return {"relevance": "HIGHLY_RELEVANT" if keep else "IRRELEVANT", "rationale": "r", "keep": keep}
+
+
+def _turn(kept, dropped=()):
+    return {
+        "kept_chunk_ids"   : list(kept),
+        "chunk_assessments": {
+            **{cid: _verdict(True) for cid in kept},
+            **{cid: _verdict(False) for cid in dropped},
+        },
+    }
+
+
+def test_unknown_session_id_starts_a_new_session_with_server_id(shared):
+    store = _store(shared)
+    session = store.get_or_create("client-chosen", namespace="docs")
+
+    assert session.session_id != "client-chosen"
+    assert store.get("client-chosen", namespace="docs") is None
+    # Sessions are only stored once a turn was recorded
+    assert store.get(session.session_id, namespace="docs") is None
+    store.record_turn(session, "What is A?", _turn(["a1"]))
+    assert list(store.get(session.session_id, namespace="docs").questions) == ["What is A?"]
+
+
+def test_scope_mismatch_starts_a_new_session(shared):
+    store = _store(shared)
+    session = store.get_or_create(namespace="docs", filters={"source": "a.pdf"})
+    store.record_turn(session, "What is A?", _turn(["a1"]))
+
+    assert store.get(session.session_id, namespace="other", filters={"source": "a.pdf"}) is None
+    assert store.get(session.session_id, namespace="docs", filters={"source": "a.pdf"}) is not None
+    other = store.get_or_create(session.session_id, namespace="docs", filters={"source": "b.pdf"})
+    assert other.session_id != session.session_id
+
+
+def test_carried_chunks_reuse_the_verdict_they_were_kept_with(shared):
+    store = _store(shared)
+    session = store.get_or_create(namespace="docs")
+    store.record_turn(session, "What is A?", _turn(["a1", "a2", "a3"], dropped=["x"]))
+
+    flow = store.get(session.session_id, namespace="docs").to_flow_session("And B?")
+    assert flow["history"] == ["What is A?"]
+    assert flow["session_chunk_ids"] == ["a1", "a2"]
+    # Only the carried chunks' positive verdicts are reused for a new question
+    assert set(flow["cached_assessments"]) == {"a1", "a2"}
+    assert all(verdict["keep"] for verdict in flow["cached_assessments"].values())
+
+
+def test_repeated_question_reuses_all_of_its_verdicts(shared):
+    store = _store(shared)
+    session = store.get_or_create(namespace="docs")
+    store.record_turn(session, "What is A?", _turn(["a1"], dropped=["x"]))
+
+    cached = store.get(session.session_id, namespace="docs").to_flow_session("  what is a? ")["cached_assessments"]
+    assert cached["x"]["keep"] is False
+    assert cached["a1"]["keep"] is True
+
+
+def test_newest_kept_chunks_come_first_and_are_capped(shared):
+    store = _store(shared)
+    session = store.get_or_create(namespace="docs")
+    store.record_turn(session, "q1", _turn(["a1", "a2", "a3"]))
+    store.record_turn(session, "q2", _turn(["b1", "a1", "b2"]))
+
+    stored = store.get(session.session_id, namespace="docs")
+    assert stored.kept_chunk_ids == ["b1", "b2", "a1", "a2"]
+    assert set(stored.kept_verdicts) == set(stored.kept_chunk_ids)
+
+
+def test_turns_recorded_by_other_workers_are_kept(tmp_path):
+    # Two workers: separate store handles on the same shared file
+    first = _store(SharedStore(tmp_path / "shared.sqlite3"))
+    second = _store(SharedStore(tmp_path / "shared.sqlite3"))
+    session = first.get_or_create(namespace="docs")
+    first.record_turn(session, "q1", _turn(["a1"]))
+
+    stale = second.get(session.session_id, namespace="docs")
+    first.record_turn(session, "q2", _turn(["b1"]))
+    second.record_turn(stale, "q3", _turn(["c1"]))
+
+    stored = first.get(session.session_id, namespace="docs")
+    assert list(stored.questions) == ["q1", "q2", "q3"]
+    assert stored.kept_chunk_ids == ["c1", "b1", "a1"]
+
+
+def test_sessions_expire_after_their_ttl(shared):
+    store = _store(shared, ttl_seconds=-1)
+    session = store.get_or_create(namespace="docs")
+    store.record_turn(session, "q1", _turn(["a1"]))
+
+    assert store.get(session.session_id, namespace="docs") is None
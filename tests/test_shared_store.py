@@ -0,0 +1,97 @@
+import sqlite3
+
+import pytest
+
+from src.app.core.cache.shared_store import SharedStore
+
+
+class _BusyConnection:
+    def execute(self, *args, **kwargs):
+        raise sqlite3.OperationalError("database is locked")
+
+    executemany = execute
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+
+def test_put_get_and_expiry(tmp_path):
+    store = SharedStore(tmp_path / "cache.sqlite3")
+    store.put("answer:docs", "q1", b"one")
+    store.put("answer:docs", "q2", b"two", ttl_seconds=-1)
+
+    assert store.get("answer:docs", "q1") == b"one"
+    assert store.get("answer:docs", "q2") is None
+    assert store.get("answer:other", "q1") is None
+
+
+def test_clear_drops_only_its_bucket(tmp_path):
+    store = SharedStore(tmp_path / "cache.sqlite3")
+    store.put("answer:a", "q", b"a")
+    store.put("answer:b", "q", b"b")
+
+    store.clear("answer:a")
+    assert store.get("answer:a", "q") is None
+    assert store.get("answer:b", "q") == b"b"
+
+
+def test_prune_evicts_oldest_writes_beyond_max_entries(tmp_path):
+    store = SharedStore(tmp_path / "cache.sqlite3", max_entries=2)
+    for key in ("a", "b", "c"):
+        store.put("bucket", key, key.encode())
+    store.put("bucket", "a", b"again")
+
+    store.prune()
+    assert store.get("bucket", "b") is None
+    assert store.get("bucket", "c") == b"c"
+    assert store.get("bucket", "a") == b"again"
+
+
+def test_busy_database_is_logged_and_treated_as_a_miss(tmp_path, monkeypatch, caplog):
+    store = SharedStore(tmp_path / "cache.sqlite3")
+    monkeypatch.setattr(store, "_connection", lambda: _BusyConnection())
+
+    assert store.get("bucket", "key") is None
+    store.put("bucket", "key", b"value")
+    store.clear("bucket")
+    store.prune()
+    assert len([r for r in caplog.records if "database is locked" in r.getMessage()]) == 4
+
+
+def test_get_many_and_values_skip_expired_entries(tmp_path):
+    store = SharedStore(tmp_path / "cache.sqlite3")
+    store.put_many("chunk", [("a", b"1"), ("b", b"2")])
+    store.put("chunk", "c", b"3", ttl_seconds=-1)
+
+    assert store.get_many("chunk", ["a", "c", "missing"]) == {"a": b"1"}
+    assert store.values("chunk", limit=1) == [b"2"]
+    assert store.values("chunk", limit=10) == [b"2", b"1"]
+
+
+def test_update_applies_to_the_latest_value(tmp_path):
+    first = SharedStore(tmp_path / "cache.sqlite3")
+    second = SharedStore(tmp_path / "cache.sqlite3")
+
+    def append(suffix):
+        return lambda current: (current or b"") + suffix
+
+    assert first.update("session", "s1", append(b"a")) is True
+    assert second.update("session", "s1", append(b"b")) is True
+    assert first.get("session", "s1") == b"ab"
+
+
+def test_update_leaves_the_value_unchanged_when_apply_fails(tmp_path):
+    store = SharedStore(tmp_path / "cache.sqlite3")
+    store.put("session", "s1", b"kept")
+
+    def fail(current):
+        raise ValueError("bad turn")
+
+    with pytest.raises(ValueError):
+        store.update("session", "s1", fail)
+    assert store.get("session", "s1") == b"kept"
+    store.put("session", "s2", b"next")
+    assert store.get("session", "s2") == b"next"
@@ -0,0 +1,82 @@
+import pytest
+
+from src.app.core.agents.streaming import is_unsupported_reply, split_sentences
+from src.app.core.agents.support import content_terms, support_score
+
+
+def _sentences(text, chunk_size=3):
+    tokens = [text[i:i + chunk_size] for i in range(0, len(text), chunk_size)]
+    return [sentence for sentence, _separator in split_sentences(tokens)]
+
+
+@pytest.mark.parametrize("text, expected", [
+    (
+        "Revenue grew as shown in Fig. 3 of the report. Costs fell.",
+        ["Revenue grew as shown in Fig. 3 of the report.", "Costs fell."],
+    ),
+    (
+        "Most sales were in the U.S. market last year. Europe was second.",
+        ["Most sales were in the U.S. market last year.", "Europe was second."],
+    ),
+    (
+        "The method, e.g. HNSW, is fast. It scales well too.",
+        ["The method, e.g. HNSW, is fast.", "It scales well too."],
+    ),
+    (
+        "The index was built by J. Smith in 2020. It is still used.",
+        ["The index was built by J. Smith in 2020.", "It is still used."],
+    ),
+    (
+        "The total was 3.5 million dollars. that figure is final. Next one here.",
+        ["The total was 3.5 million dollars. that figure is final.", "Next one here."],
+    ),
+])
+def test_split_keeps_abbreviations_initials_and_lowercase_continuations(text, expected):
+    assert _sentences(text) == expected
+
+
+def test_short_fragments_join_the_next_sentence():
+    assert _sentences("Yes. No. The answer depends on the index.") == [
+        "Yes. No. The answer depends on the index.",
+    ]
+
+
+def test_line_breaks_always_split_numbered_lists():
+    text = "Steps:\n1. Embed the query.\n2. Search the index.\n3. Re-rank results."
+    assert _sentences(text) == [
+        "Steps:",
+        "1. Embed the query.",
+        "2. Search the index.",
+        "3. Re-rank results.",
+    ]
+
+
+def test_separators_rebuild_the_original_text():
+    text = "First sentence is here. Second one follows!\n\nThird after a gap?"
+    pairs = list(split_sentences([text[i:i + 2] for i in range(0, len(text), 2)]))
+    assert "".join(sentence + separator for sentence, separator in pairs) == text
+
+
+def test_support_score_counts_content_terms_found_in_context():
+    context = content_terms("Pinecone stores vectors in namespaces for tenants.")
+    assert support_score("Pinecone stores vectors in namespaces.", context) == 1.0
+    assert support_score("Pinecone stores images.", context) == pytest.approx(2 / 3)
+
+
+def test_support_score_rejects_numbers_missing_from_context():
+    context = content_terms("Revenue grew 12% to 4.5 billion in 2023.")
+    assert support_score("Revenue grew 12 percent in 2023.", context) > 0
+    assert support_score("Revenue grew 15 percent in 2023.", context) == 0.0
+
+
+def test_support_score_of_sentence_without_content_terms_is_one():
+    assert support_score("It is.", set()) == 1.0
+
+
+@pytest.mark.parametrize("reply", ["UNSUPPORTED", "UNSUPPORTED.", '"UNSUPPORTED"', "Unsupported", " unsupported!\n"])
+def test_unsupported_marker_variants_are_recognized(reply):
+    assert is_unsupported_reply(reply)
+
+
+def test_corrected_sentences_are_not_mistaken_for_the_marker():
+    assert not is_unsupported_reply("The claim is unsupported by the report.")